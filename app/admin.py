@@ -5,7 +5,9 @@ ALX Project Nexus
 
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
+from django.db.models import Count, Q
 from django.utils.html import format_html
+from .cache import invalidate_listing_caches
 from .models import User, Category, Product, ProductImage
 
 
@@ -70,6 +72,7 @@ class CategoryAdmin(admin.ModelAdmin):
     ]
     
     list_filter = ['is_active', 'parent', 'created_at']
+    list_select_related = ['parent']
     search_fields = ['name', 'description']
     prepopulated_fields = {'slug': ('name',)}
     
@@ -89,14 +92,16 @@ class CategoryAdmin(admin.ModelAdmin):
     readonly_fields = ['created_at', 'updated_at']
     
     def product_count_display(self, obj):
-        """Display product count for this category"""
-        count = obj.get_product_count()
-        return f"{count} products"
+        """Display active product count for this category"""
+        return f"{obj._product_count} products"
     product_count_display.short_description = "Products"
+    product_count_display.admin_order_field = '_product_count'
     
     def get_queryset(self, request):
-        """Optimize queries with select_related"""
-        return super().get_queryset(request).select_related('parent')
+        """Annotate active product counts in the changelist query"""
+        return super().get_queryset(request).annotate(
+            _product_count=Count('products', filter=Q(products__is_active=True))
+        )
 
 
 class ProductImageInline(admin.TabularInline):
@@ -106,6 +111,12 @@ class ProductImageInline(admin.TabularInline):
     model = ProductImage
     extra = 3
     fields = ['image', 'alt_text', 'display_order']
+    
+    def get_queryset(self, request):
+        """Join the product used by each image's str() in the inline rows"""
+        return super().get_queryset(request).select_related('product').only(
+            'id', 'image', 'alt_text', 'display_order', 'product__id', 'product__name'
+        )
 
 
 @admin.register(Product)
@@ -123,6 +134,8 @@ class ProductAdmin(admin.ModelAdmin):
         'categories', 'seller', 'created_at'
     ]
     
+    list_select_related = ['seller']
+    
     search_fields = ['name', 'sku', 'description', 'seller__username']
     prepopulated_fields = {'slug': ('name',)}
     
@@ -180,26 +193,23 @@ class ProductAdmin(admin.ModelAdmin):
     def make_active(self, request, queryset):
         """Bulk action to activate products"""
         updated = queryset.update(is_active=True)
+        invalidate_listing_caches()
         self.message_user(request, f'{updated} products were activated.')
     make_active.short_description = "Mark selected products as active"
     
     def make_inactive(self, request, queryset):
         """Bulk action to deactivate products"""
         updated = queryset.update(is_active=False)
+        invalidate_listing_caches()
         self.message_user(request, f'{updated} products were deactivated.')
     make_inactive.short_description = "Mark selected products as inactive"
     
     def make_featured(self, request, queryset):
         """Bulk action to feature products"""
         updated = queryset.update(is_featured=True)
+        invalidate_listing_caches()
         self.message_user(request, f'{updated} products were marked as featured.')
     make_featured.short_description = "Mark selected products as featured"
-    
-    def get_queryset(self, request):
-        """Optimize queries with select_related and prefetch_related"""
-        return super().get_queryset(request).select_related(
-            'seller'
-        ).prefetch_related('categories')
 
 
 @admin.register(ProductImage)
@@ -209,6 +219,7 @@ class ProductImageAdmin(admin.ModelAdmin):
     """
     list_display = ['product', 'alt_text', 'display_order', 'created_at']
     list_filter = ['created_at']
+    list_select_related = ['product']
     search_fields = ['product__name', 'alt_text']
     
     fieldsets = (
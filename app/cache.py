@@ -0,0 +1,154 @@
+"""
+Response caching helpers for list endpoints
+"""
+import hashlib
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import DEFAULT_CACHE_ALIAS, cache
+
+LIST_CACHE_TIMEOUT = 60
+# Categories change rarely and every change invalidates the listing, but
+# only on a cache shared by all workers (see cache_is_shared)
+CATEGORY_LIST_CACHE_TIMEOUT = 60 * 60
+# The home and API root documents only change with a deploy
+ROOT_CACHE_TIMEOUT = 60 * 60
+PRODUCT_LIST_CACHE = 'products'
+CATEGORY_LIST_CACHE = 'categories'
+
+PRODUCT_VIEWS_KEY = 'product-views:{}'
+# Products with buffered views, kept as a numbered log of pks so a flush
+# only visits those products instead of the whole catalog
+DIRTY_PRODUCTS_SEQ_KEY = 'product-views:dirty-seq'
+DIRTY_PRODUCTS_SLOT_KEY = 'product-views:dirty:{}'
+DIRTY_PRODUCTS_CURSOR_KEY = 'product-views:dirty-flushed'
+DIRTY_PRODUCTS_RETRY_KEY = 'product-views:dirty-retry'
+# Pending views after which a product is logged again, in case its first
+# log entry was evicted before a flush read it
+DIRTY_PRODUCTS_RELOG_EVERY = 100
+
+# Backends private to each process: a version bump only reaches the
+# worker that made the change
+PROCESS_LOCAL_CACHE_BACKENDS = {
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+}
+
+
+def cache_is_shared(alias=DEFAULT_CACHE_ALIAS):
+    """Whether the cache, and so its invalidation, is seen by every worker"""
+    return settings.CACHES[alias]['BACKEND'] not in PROCESS_LOCAL_CACHE_BACKENDS
+
+
+def get_cache_version(namespace):
+    """Current version of a cache namespace; bumping it orphans old entries"""
+    return cache.get_or_set(f'{namespace}:version', 1, timeout=None)
+
+
+def bump_cache_version(namespace):
+    """Invalidate every entry cached under namespace"""
+    key = f'{namespace}:version'
+    cache.add(key, 1, timeout=None)
+    cache.incr(key)
+
+
+def invalidate_listing_caches():
+    """
+    Drop cached product and category listings. The model signals call it;
+    call it yourself after bulk_create() or queryset.update(), which send
+    no signals
+    """
+    bump_cache_version(PRODUCT_LIST_CACHE)
+    bump_cache_version(CATEGORY_LIST_CACHE)
+
+
+def request_cache_key(namespace, request):
+    """Cache key for a request, independent of query parameter order"""
+    params = urlencode(sorted(request.query_params.lists()), doseq=True)
+    digest = hashlib.md5(
+        f'{request.get_host()}?{params}'.encode(), usedforsecurity=False
+    ).hexdigest()
+    return f'{namespace}:{get_cache_version(namespace)}:{digest}'
+
+
+def mark_products_dirty(pks):
+    """Log products as having buffered views for the next flush"""
+    cache.add(DIRTY_PRODUCTS_SEQ_KEY, 0, timeout=None)
+    for pk in pks:
+        slot = cache.incr(DIRTY_PRODUCTS_SEQ_KEY)
+        cache.set(DIRTY_PRODUCTS_SLOT_KEY.format(slot), pk, timeout=None)
+
+
+def buffer_product_view(pk):
+    """
+    Count a product view in the cache; flush_view_counts writes it out.
+    Returns the number of views now waiting to be flushed.
+    """
+    key = PRODUCT_VIEWS_KEY.format(pk)
+    if cache.add(key, 1, timeout=None):
+        pending = 1
+    else:
+        try:
+            pending = cache.incr(key)
+        except ValueError:
+            # Flushed or evicted between add() and incr()
+            cache.set(key, 1, timeout=None)
+            pending = 1
+    if pending == 1 or pending % DIRTY_PRODUCTS_RELOG_EVERY == 0:
+        # First view since the last flush; later ones find it logged
+        mark_products_dirty([pk])
+    return pending
+
+
+def read_dirty_products():
+    """
+    Return (pks, ack): the pks logged by mark_products_dirty since the
+    last acknowledged flush, and a callable that takes them off the log.
+    Meant for a single flusher at a time.
+    
+    Entries stay logged until ack() runs, so a flush that fails or is
+    rolled back reads the same products again next time. A slot can be
+    numbered before its pk is stored; slots missing from the range are
+    looked up once more after the next ack.
+    """
+    cursor = cache.get(DIRTY_PRODUCTS_CURSOR_KEY, 0)
+    seq = cache.get(DIRTY_PRODUCTS_SEQ_KEY, 0)
+    retry = cache.get(DIRTY_PRODUCTS_RETRY_KEY, [])
+    keys = {
+        DIRTY_PRODUCTS_SLOT_KEY.format(slot): slot
+        for slot in [*retry, *range(cursor + 1, seq + 1)]
+    }
+    found = cache.get_many(keys)
+    
+    def ack():
+        cache.set_many({
+            DIRTY_PRODUCTS_CURSOR_KEY: seq,
+            DIRTY_PRODUCTS_RETRY_KEY: [
+                slot for key, slot in keys.items() if key not in found and slot > cursor
+            ],
+        }, timeout=None)
+        cache.delete_many(found)
+    
+    return set(found.values()), ack
+
+
+def get_buffered_views(pks):
+    """Return {pk: pending view count} for the given products that have any"""
+    keys = {PRODUCT_VIEWS_KEY.format(pk): pk for pk in pks}
+    return {keys[key]: delta for key, delta in cache.get_many(keys).items() if delta}
+
+
+def discard_buffered_views(deltas):
+    """
+    Subtract views written to the database from the buffer, keeping views
+    counted meanwhile; products left with pending views are logged again
+    """
+    viewed_meanwhile = []
+    for pk, delta in deltas.items():
+        try:
+            if cache.decr(PRODUCT_VIEWS_KEY.format(pk), delta) > 0:
+                viewed_meanwhile.append(pk)
+        except ValueError:
+            # Evicted after it was read
+            pass
+    mark_products_dirty(viewed_meanwhile)
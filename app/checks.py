@@ -0,0 +1,22 @@
+"""
+System checks for ALX Project Nexus
+"""
+from django.conf import settings
+from django.core import checks
+
+from .cache import cache_is_shared
+
+
+@checks.register(checks.Tags.caches)
+def check_view_count_buffer_cache(app_configs, **kwargs):
+    """Buffered view counts need a cache that flush_view_counts can see"""
+    if settings.BUFFER_PRODUCT_VIEW_COUNTS and not cache_is_shared():
+        return [
+            checks.Error(
+                'BUFFER_PRODUCT_VIEW_COUNTS needs a cache shared between '
+                'processes; the default cache is process-local.',
+                hint='Set REDIS_URL, or turn BUFFER_PRODUCT_VIEW_COUNTS off.',
+                id='app.E001',
+            )
+        ]
+    return []
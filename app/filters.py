@@ -2,11 +2,96 @@
 Custom filters for products and categories
 """
 import django_filters
-from django.db import models
+from django.contrib.postgres.search import SearchQuery
+from django.db import connections, models
+from django_filters.rest_framework import DjangoFilterBackend
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import OrderingFilter, SearchFilter
 from .models import Product, Category
 
 
-class ProductFilter(django_filters.FilterSet):
+class LazyDjangoFilterBackend(DjangoFilterBackend):
+    """
+    DjangoFilterBackend that skips building the FilterSet (and its form)
+    when the request has no query parameters to filter on
+    """
+    
+    def filter_queryset(self, request, queryset, view):
+        if not request.query_params:
+            return queryset
+        return super().filter_queryset(request, queryset, view)
+
+
+class CachedFormFilterSet(django_filters.FilterSet):
+    """
+    FilterSet that builds its form class once per FilterSet class.
+    
+    django-filter otherwise rebuilds every filter's form field (labels,
+    widgets, lookups) and a new form class on each request. Form
+    instances still copy the fields, so requests share no state.
+    """
+    
+    def get_form_class(self):
+        form_class = type(self).__dict__.get('_form_class')
+        if form_class is None:
+            form_class = super().get_form_class()
+            type(self)._form_class = form_class
+        return form_class
+
+
+def search_products(queryset, value):
+    """
+    Product search shared by ?search= and its alias ?q=.
+    
+    PostgreSQL answers from the GIN-indexed search_vector (name and
+    description) plus a SKU prefix match, which the unique index on sku
+    serves, instead of ILIKE '%term%' scans no index can serve. Other
+    databases match substrings of name, description and SKU.
+    """
+    if connections[queryset.db].vendor == 'postgresql':
+        return queryset.filter(
+            models.Q(search_vector=SearchQuery(value, config='english', search_type='websearch'))
+            | models.Q(sku__startswith=value.upper())
+        )
+    return queryset.filter(
+        models.Q(name__icontains=value)
+        | models.Q(description__icontains=value)
+        | models.Q(sku__icontains=value)
+    )
+
+
+class ProductSearchFilter(SearchFilter):
+    """SearchFilter answering ?search= with search_products"""
+    
+    def filter_queryset(self, request, queryset, view):
+        search = request.query_params.get(self.search_param, '').strip()
+        if not search:
+            return queryset
+        return search_products(queryset, search)
+
+
+class StrictOrderingFilter(OrderingFilter):
+    """
+    OrderingFilter that answers 400 for fields outside the view's
+    ordering_fields instead of silently falling back to the default
+    ordering, so clients never assume a sort the index-backed whitelist
+    does not provide
+    """
+    
+    def get_ordering(self, request, queryset, view):
+        params = request.query_params.get(self.ordering_param)
+        if params:
+            fields = [param.strip() for param in params.split(',') if param.strip()]
+            valid = {item[0] for item in self.get_valid_fields(queryset, view, {'request': request})}
+            invalid = [term for term in fields if term.lstrip('-') not in valid]
+            if invalid:
+                raise ValidationError({
+                    self.ordering_param: [f"Cannot order by: {', '.join(invalid)}"]
+                })
+        return super().get_ordering(request, queryset, view)
+
+
+class ProductFilter(CachedFormFilterSet):
     """Advanced product filtering"""
     
     # Price range filtering
@@ -28,6 +113,9 @@ class ProductFilter(django_filters.FilterSet):
     in_stock = django_filters.BooleanFilter(method='filter_in_stock')
     low_stock = django_filters.BooleanFilter(method='filter_low_stock')
     
+    # Alias of ?search=, kept for clients of the original full-text filter
+    q = django_filters.CharFilter(method='filter_full_text')
+    
     # Seller filtering
     seller = django_filters.CharFilter(field_name="seller__username", lookup_expr='iexact')
     
@@ -49,6 +137,10 @@ class ProductFilter(django_filters.FilterSet):
             return queryset.filter(stock_quantity__gt=0)
         return queryset
     
+    def filter_full_text(self, queryset, name, value):
+        """Same search as ?search= (see search_products)"""
+        return search_products(queryset, value)
+    
     def filter_low_stock(self, queryset, name, value):
         """Filter products with low stock (less than 10)"""
         if value:
@@ -56,7 +148,7 @@ class ProductFilter(django_filters.FilterSet):
         return queryset
 
 
-class CategoryFilter(django_filters.FilterSet):
+class CategoryFilter(CachedFormFilterSet):
     """Category filtering"""
     
     name = django_filters.CharFilter(lookup_expr='icontains')
@@ -68,6 +160,9 @@ class CategoryFilter(django_filters.FilterSet):
     
     def filter_has_products(self, queryset, name, value):
         """Filter categories that have products"""
+        has_products = models.Exists(
+            Product.categories.through.objects.filter(category=models.OuterRef('pk'))
+        )
         if value:
-            return queryset.filter(products__isnull=False).distinct()
-        return queryset.filter(products__isnull=True).distinct()
\ No newline at end of file
+            return queryset.filter(has_products)
+        return queryset.filter(~has_products)
\ No newline at end of file
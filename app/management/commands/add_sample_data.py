@@ -1,37 +1,61 @@
 # app/management/commands/add_sample_data.py
 from django.core.management.base import BaseCommand
 from django.contrib.auth import get_user_model
+from django.utils.text import slugify
+from app.cache import invalidate_listing_caches
 from app.models import Category, Product
 
 User = get_user_model()
 
+SAMPLE_CATEGORIES = [
+    {"name": "Electronics", "description": "Electronic devices"},
+    {"name": "Books", "description": "Books and education"},
+]
+
+SAMPLE_PRODUCTS = [
+    {
+        "name": "iPhone 15",
+        "description": "Latest iPhone",
+        "price": "15999.99",
+        "stock_quantity": 10,
+    },
+]
+
+
 class Command(BaseCommand):
     def handle(self, *args, **options):
-        # Create categories
-        electronics, _ = Category.objects.get_or_create(
-            name="Electronics", 
-            defaults={"description": "Electronic devices"}
-        )
-        books, _ = Category.objects.get_or_create(
-            name="Books", 
-            defaults={"description": "Books and education"}
+        # Create categories in one round-trip; bulk_create skips save(),
+        # so slugs are set here. Existing rows are left untouched.
+        Category.objects.bulk_create(
+            [
+                Category(slug=slugify(data["name"]), **data)
+                for data in SAMPLE_CATEGORIES
+            ],
+            batch_size=500,
+            ignore_conflicts=True,
         )
-        
+
         # Make a user a seller
         user = User.objects.first()
         if user:
             user.is_seller = True
-            user.save()
-            
-            # Create sample products
-            Product.objects.get_or_create(
-                name="iPhone 15",
-                defaults={
-                    "description": "Latest iPhone",
-                    "price": "15999.99",
-                    "stock_quantity": 10,
-                    "seller": user
-                }
+            user.save(update_fields=["is_seller"])
+
+            # Create sample products (slug and SKU precomputed likewise)
+            Product.objects.bulk_create(
+                [
+                    Product(
+                        slug=slugify(data["name"]),
+                        sku=Product.generate_sku(data["name"]),
+                        seller=user,
+                        **data
+                    )
+                    for data in SAMPLE_PRODUCTS
+                ],
+                batch_size=500,
+                ignore_conflicts=True,
             )
-            
-        self.stdout.write("Sample data created!")
\ No newline at end of file
+
+        # bulk_create sends no post_save, so cached listings are dropped here
+        invalidate_listing_caches()
+        self.stdout.write("Sample data created!")
@@ -0,0 +1,46 @@
+# app/management/commands/flush_view_counts.py
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Case, F, IntegerField, Value, When
+from app.cache import discard_buffered_views, get_buffered_views, read_dirty_products
+from app.models import Product
+
+BATCH_SIZE = 500
+
+
+class Command(BaseCommand):
+    help = (
+        "Write product views buffered in the cache to the database; "
+        "schedule it (e.g. cron every 30s) when BUFFER_PRODUCT_VIEW_COUNTS is on"
+    )
+
+    def handle(self, *args, **options):
+        # Only products viewed since the last flush, not the whole catalog
+        pks, ack = read_dirty_products()
+        pks = sorted(pks)
+        flushed = 0
+        for start in range(0, len(pks), BATCH_SIZE):
+            flushed += self.flush(pks[start:start + BATCH_SIZE])
+        # Take the products off the dirty log only once every batch is
+        # stored; until then a failed or rolled-back run is simply redone
+        transaction.on_commit(ack)
+
+        self.stdout.write(f"Flushed {flushed} product views")
+
+    def flush(self, pks):
+        deltas = get_buffered_views(pks)
+        if not deltas:
+            return 0
+        with transaction.atomic():
+            # One UPDATE for the whole batch, adding each product's own delta
+            Product.objects.filter(pk__in=deltas).update(
+                view_count=F("view_count") + Case(
+                    *[When(pk=pk, then=Value(delta)) for pk, delta in deltas.items()],
+                    default=Value(0),
+                    output_field=IntegerField(),
+                )
+            )
+            # Take the views out of the buffer only once they are stored,
+            # so a failed UPDATE leaves them to be flushed again
+            transaction.on_commit(lambda: discard_buffered_views(deltas))
+        return sum(deltas.values())
@@ -0,0 +1,42 @@
+# Generated by Django 5.2.18 on 2026-10-14 03:24
+
+from django.db import migrations, models
+
+
+def create_trigram_index(apps, schema_editor):
+    """Trigram index backing name__icontains lookups (PostgreSQL only)"""
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    schema_editor.execute(
+        'CREATE INDEX IF NOT EXISTS prod_name_trgm ON products USING gin (name gin_trgm_ops)'
+    )
+
+
+def drop_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('DROP INDEX IF EXISTS prod_name_trgm')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['-created_at'], name='prod_active_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(condition=models.Q(('is_active', True), ('is_featured', True)), fields=['-created_at'], name='prod_featured_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(condition=models.Q(('stock_quantity__gt', 0), ('stock_quantity__lt', 10)), fields=['stock_quantity'], name='prod_lowstock_idx'),
+        ),
+        migrations.RunPython(create_trigram_index, drop_trigram_index),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 5.2.18 on 2026-10-14 03:31
+
+import django.contrib.postgres.search
+from django.db import migrations
+
+
+def create_search_vector_trigger(apps, schema_editor):
+    """Index and maintain products.search_vector (PostgreSQL only)"""
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(
+        'CREATE INDEX IF NOT EXISTS prod_search_vector_gin '
+        'ON products USING gin (search_vector)'
+    )
+    schema_editor.execute(
+        'CREATE TRIGGER products_search_vector_update '
+        'BEFORE INSERT OR UPDATE OF name, description, search_vector ON products '
+        'FOR EACH ROW EXECUTE FUNCTION '
+        "tsvector_update_trigger(search_vector, 'pg_catalog.english', name, description)"
+    )
+    # Touch every row so the trigger fills in existing products
+    schema_editor.execute('UPDATE products SET name = name')
+
+
+def drop_search_vector_trigger(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('DROP TRIGGER IF EXISTS products_search_vector_update ON products')
+    schema_editor.execute('DROP INDEX IF EXISTS prod_search_vector_gin')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0002_product_partial_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='product',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunPython(create_search_vector_trigger, drop_search_vector_trigger),
+    ]
@@ -0,0 +1,38 @@
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.db import migrations
+from django.db.models.functions import Upper
+
+# name__icontains compiles to UPPER("products"."name"::text) LIKE UPPER(%s)
+# on PostgreSQL, which only an index on UPPER(name) can serve
+NAME_TRIGRAM_INDEX = GinIndex(
+    OpClass(Upper('name'), name='gin_trgm_ops'),
+    name='prod_name_trgm',
+)
+
+
+def index_upper_name(apps, schema_editor):
+    """Swap the unusable trigram index on bare name for UPPER(name) (PostgreSQL only)"""
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('DROP INDEX IF EXISTS prod_name_trgm')
+    schema_editor.add_index(apps.get_model('app', 'Product'), NAME_TRIGRAM_INDEX)
+
+
+def index_bare_name(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.remove_index(apps.get_model('app', 'Product'), NAME_TRIGRAM_INDEX)
+    schema_editor.execute(
+        'CREATE INDEX IF NOT EXISTS prod_name_trgm ON products USING gin (name gin_trgm_ops)'
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0006_product_ordering_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(index_upper_name, index_bare_name),
+    ]
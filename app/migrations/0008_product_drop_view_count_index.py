@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-14 04:17
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0007_product_name_trigram_expression'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='product',
+            name='prod_active_views_idx',
+        ),
+    ]
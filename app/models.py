@@ -3,14 +3,55 @@ E-Commerce Backend Models
 ALX Project Nexus
 """
 
-from django.db import models
+from contextlib import nullcontext
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections, models, router, transaction, IntegrityError
 from django.contrib.auth.models import AbstractUser
+from django.contrib.postgres.search import SearchVectorField
 from django.core.validators import MinValueValidator, MaxValueValidator
+from django.db.models.functions import Round
 from django.utils.text import slugify
-from PIL import Image
 import uuid
 import os
 
+from .cache import buffer_product_view
+from .tasks import resize_image_later
+
+
+def unique_slug(model, slug, pk=None):
+    """
+    Return slug, suffixed with -1, -2, ... if it clashes with another row.
+    
+    All candidate slugs are fetched in one query instead of probing the
+    database once per suffix.
+    """
+    existing = set(
+        model.objects.filter(slug__startswith=slug)
+        .exclude(pk=pk)
+        .values_list('slug', flat=True)
+    )
+    candidate = slug
+    counter = 1
+    while candidate in existing:
+        candidate = f"{slug}-{counter}"
+        counter += 1
+    return candidate
+
+
+def insert_guard(instance, using=None):
+    """
+    Context for a save that may hit a unique constraint.
+    
+    Inside a transaction a savepoint keeps the IntegrityError from
+    breaking it. In autocommit a failed INSERT leaves the connection
+    usable, so no atomic() block (and its BEGIN/COMMIT) is opened.
+    """
+    using = using or router.db_for_write(type(instance), instance=instance)
+    if connections[using].in_atomic_block:
+        return transaction.atomic(using=using)
+    return nullcontext()
+
 
 class User(AbstractUser):
     """
@@ -64,15 +105,12 @@ class User(AbstractUser):
         return self.username
     
     def save(self, *args, **kwargs):
-        """Override save to resize profile pictures"""
+        """Override save to resize newly uploaded profile pictures"""
+        new_upload = bool(self.profile_picture) and not self.profile_picture._committed
         super().save(*args, **kwargs)
         
-        if self.profile_picture:
-            img = Image.open(self.profile_picture.path)
-            if img.height > 300 or img.width > 300:
-                output_size = (300, 300)
-                img.thumbnail(output_size)
-                img.save(self.profile_picture.path)
+        if new_upload:
+            resize_image_later(self.profile_picture.path, (300, 300))
 
 
 class Category(models.Model):
@@ -126,30 +164,85 @@ class Category(models.Model):
     
     def save(self, *args, **kwargs):
         """Auto-generate slug from name"""
-        if not self.slug:
-            self.slug = slugify(self.name)
-            # Ensure unique slug
-            counter = 1
-            original_slug = self.slug
-            while Category.objects.filter(slug=self.slug).exclude(pk=self.pk).exists():
-                self.slug = f"{original_slug}-{counter}"
-                counter += 1
-        super().save(*args, **kwargs)
+        if self.slug:
+            super().save(*args, **kwargs)
+            return
+        
+        # Try the plain slug first and only resolve a unique suffix if
+        # the unique constraint rejects it
+        self.slug = slugify(self.name)
+        try:
+            with insert_guard(self, kwargs.get('using')):
+                super().save(*args, **kwargs)
+        except IntegrityError:
+            self.slug = unique_slug(Category, slugify(self.name), self.pk)
+            super().save(*args, **kwargs)
+    
+    def get_descendant_ids(self):
+        """
+        Get ids of all subcategories recursively.
+        
+        Loads the (id, parent) pairs in a single query and walks the
+        tree in Python instead of querying once per subcategory.
+        """
+        children_by_parent = {}
+        for pk, parent_id in Category.objects.filter(
+            parent__isnull=False
+        ).values_list('pk', 'parent_id'):
+            children_by_parent.setdefault(parent_id, []).append(pk)
+        
+        descendant_ids = []
+        pending = [self.pk]
+        while pending:
+            children = children_by_parent.get(pending.pop(), [])
+            descendant_ids.extend(children)
+            pending.extend(children)
+        return descendant_ids
     
     def get_all_children(self):
         """Get all subcategories recursively"""
-        children = []
-        for child in self.subcategories.all():
-            children.append(child)
-            children.extend(child.get_all_children())
-        return children
+        descendant_ids = self.get_descendant_ids()
+        if not descendant_ids:
+            return []
+        return list(Category.objects.filter(pk__in=descendant_ids))
     
     def get_product_count(self):
         """Get total number of products in this category and subcategories"""
-        count = self.products.filter(is_active=True).count()
-        for child in self.subcategories.all():
-            count += child.get_product_count()
-        return count
+        category_ids = [self.pk, *self.get_descendant_ids()]
+        return Product.objects.filter(
+            categories__in=category_ids, is_active=True
+        ).distinct().count()
+
+
+class ProductQuerySet(models.QuerySet):
+    """Product queryset with database-computed display fields"""
+    
+    def with_stock_and_discount(self):
+        """
+        Annotate is_in_stock and discount_percentage so the database
+        computes them for every row instead of Python per instance
+        """
+        return self.annotate(
+            annotated_in_stock=models.Case(
+                models.When(track_inventory=False, then=True),
+                models.When(stock_quantity__gt=0, then=True),
+                models.When(allow_backorder=True, then=True),
+                default=False,
+                output_field=models.BooleanField(),
+            ),
+            annotated_discount=models.Case(
+                models.When(
+                    compare_price__gt=models.F('price'),
+                    then=Round(
+                        (models.F('compare_price') - models.F('price'))
+                        * 100 / models.F('compare_price'),
+                        2,
+                    ),
+                ),
+                default=0,
+                output_field=models.DecimalField(max_digits=5, decimal_places=2),
+            ),
+        )
 
 
 class Product(models.Model):
@@ -216,6 +309,10 @@ class Product(models.Model):
     meta_title = models.CharField(max_length=60, blank=True, null=True)
     meta_description = models.CharField(max_length=160, blank=True, null=True)
     
+    # Full-text search document over name and description, maintained by
+    # a database trigger on PostgreSQL (see migration 0003)
+    search_vector = SearchVectorField(null=True, editable=False)
+    
     # Statistics
     view_count = models.PositiveIntegerField(default=0)
     
@@ -223,6 +320,8 @@ class Product(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = ProductQuerySet.as_manager()
+    
     class Meta:
         db_table = 'products'
         verbose_name = 'Product'
@@ -231,46 +330,86 @@ class Product(models.Model):
         indexes = [
             models.Index(fields=['slug']),
             models.Index(fields=['sku']),
-            models.Index(fields=['seller']),
             models.Index(fields=['is_active']),
             models.Index(fields=['is_featured']),
             models.Index(fields=['price']),
             models.Index(fields=['created_at']),
             models.Index(fields=['stock_quantity']),
+            # Compound indexes for active listings sorted by price and for
+            # a seller's active products (also serves seller-only lookups)
+            models.Index(fields=['is_active', 'price']),
+            models.Index(fields=['seller', 'is_active']),
+            # Partial indexes for the hot list/filter predicates
+            models.Index(
+                fields=['-created_at', '-id'],
+                name='prod_active_created_idx',
+                condition=models.Q(is_active=True),
+            ),
+            # Active-product sorts for the remaining ?ordering= fields
+            models.Index(
+                fields=['name'],
+                name='prod_active_name_idx',
+                condition=models.Q(is_active=True),
+            ),
+            models.Index(
+                fields=['-created_at'],
+                name='prod_featured_idx',
+                condition=models.Q(is_active=True, is_featured=True),
+            ),
+            models.Index(
+                fields=['stock_quantity'],
+                name='prod_lowstock_idx',
+                condition=models.Q(stock_quantity__gt=0, stock_quantity__lt=10),
+            ),
         ]
+        # PostgreSQL-only GIN indexes are created in migrations, since the
+        # SQLite test schema is built from these Meta options: pg_trgm on
+        # UPPER(name) (0007, for name__icontains) and search_vector (0003)
     
     def __str__(self):
         return self.name
     
     def save(self, *args, **kwargs):
         """Auto-generate slug and SKU"""
-        if not self.slug:
-            self.slug = slugify(self.name)
-            # Ensure unique slug
-            counter = 1
-            original_slug = self.slug
-            while Product.objects.filter(slug=self.slug).exclude(pk=self.pk).exists():
-                self.slug = f"{original_slug}-{counter}"
-                counter += 1
-        
-        if not self.sku:
-            # Generate SKU: first 3 letters of name + random number
-            name_part = ''.join(c for c in self.name if c.isalpha())[:3].upper()
-            random_part = str(uuid.uuid4().int)[:6]
-            self.sku = f"{name_part}-{random_part}"
-            
-            # Ensure unique SKU
-            counter = 1
-            original_sku = self.sku
-            while Product.objects.filter(sku=self.sku).exclude(pk=self.pk).exists():
-                self.sku = f"{original_sku}-{counter}"
-                counter += 1
+        # Values annotated by with_stock_and_discount() describe the row as
+        # it was loaded; drop them so the properties recompute from the
+        # fields being saved
+        self.__dict__.pop('annotated_in_stock', None)
+        self.__dict__.pop('annotated_discount', None)
+        generate_slug = not self.slug
+        generate_sku = not self.sku
+        if not (generate_slug or generate_sku):
+            super().save(*args, **kwargs)
+            return
         
-        super().save(*args, **kwargs)
+        # Save optimistically with the plain slug and a random SKU, and let
+        # the unique constraints catch the uncommon clash instead of
+        # probing the database before every insert
+        if generate_slug:
+            self.slug = slugify(self.name)
+        if generate_sku:
+            self.sku = self.generate_sku(self.name)
+        try:
+            with insert_guard(self, kwargs.get('using')):
+                super().save(*args, **kwargs)
+        except IntegrityError:
+            if generate_slug:
+                self.slug = unique_slug(Product, slugify(self.name), self.pk)
+            if generate_sku:
+                self.sku = self.generate_sku(self.name)
+            super().save(*args, **kwargs)
+    
+    @staticmethod
+    def generate_sku(name):
+        """Generate SKU: first 3 letters of name + random hex suffix"""
+        name_part = ''.join(c for c in name if c.isalpha())[:3].upper()
+        return f"{name_part}-{uuid.uuid4().hex[:8].upper()}"
     
     @property
     def is_in_stock(self):
         """Check if product is in stock"""
+        if hasattr(self, 'annotated_in_stock'):
+            return self.annotated_in_stock
         if not self.track_inventory:
             return True
         return self.stock_quantity > 0 or self.allow_backorder
@@ -278,6 +417,8 @@ class Product(models.Model):
     @property
     def discount_percentage(self):
         """Calculate discount percentage if compare_price is set"""
+        if hasattr(self, 'annotated_discount'):
+            return self.annotated_discount
         if self.compare_price and self.compare_price > self.price:
             return round(((self.compare_price - self.price) / self.compare_price) * 100, 2)
         return 0
@@ -290,9 +431,34 @@ class Product(models.Model):
         return 0
     
     def increment_view_count(self):
-        """Increment product view count"""
-        self.view_count += 1
-        self.save(update_fields=['view_count'])
+        """
+        Increment product view count.
+        
+        With BUFFER_PRODUCT_VIEW_COUNTS the view is counted in the cache
+        and written to the database later by flush_view_counts; buffered
+        views not yet flushed are included in the in-memory count.
+        Otherwise it is a single atomic UPDATE, which on PostgreSQL also
+        returns the stored count in the same round-trip.
+        """
+        if settings.BUFFER_PRODUCT_VIEW_COUNTS:
+            pending = buffer_product_view(self.pk)
+            self.view_count = (self.view_count or 0) + pending
+            return
+        connection = connections[self._state.db or DEFAULT_DB_ALIAS]
+        if connection.vendor == 'postgresql':
+            quote = connection.ops.quote_name
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f'UPDATE {quote(self._meta.db_table)} SET view_count = view_count + 1 '
+                    f'WHERE {quote(self._meta.pk.column)} = %s RETURNING view_count',
+                    [self._meta.pk.get_db_prep_value(self.pk, connection)],
+                )
+                row = cursor.fetchone()
+            if row is not None:
+                self.view_count = row[0]
+            return
+        Product.objects.filter(pk=self.pk).update(view_count=models.F('view_count') + 1)
+        self.view_count = (self.view_count or 0) + 1
 
 
 class ProductImage(models.Model):
@@ -318,16 +484,13 @@ class ProductImage(models.Model):
         return f"{self.product.name} - Image {self.display_order + 1}"
     
     def save(self, *args, **kwargs):
-        """Resize image and set alt_text if not provided"""
+        """Resize newly uploaded image and set alt_text if not provided"""
         if not self.alt_text:
             self.alt_text = f"{self.product.name} image"
         
+        new_upload = bool(self.image) and not self.image._committed
         super().save(*args, **kwargs)
         
         # Resize image
-        if self.image:
-            img = Image.open(self.image.path)
-            if img.height > 800 or img.width > 800:
-                output_size = (800, 800)
-                img.thumbnail(output_size)
-                img.save(self.image.path)
\ No newline at end of file
+        if new_upload:
+            resize_image_later(self.image.path, (800, 800))
\ No newline at end of file
@@ -0,0 +1,21 @@
+# app/pagination.py
+from rest_framework.pagination import CursorPagination
+
+
+class ProductCursorPagination(CursorPagination):
+    """
+    Keyset pagination for the product catalog.
+    
+    Each page is a range scan from the cursor position (backed by the
+    prod_active_created_idx partial index) rather than an OFFSET that
+    reads and discards every earlier row. ?ordering= from OrderingFilter
+    is honoured.
+    """
+    ordering = ('-created_at', '-id')
+    
+    def get_ordering(self, request, queryset, view):
+        # Break ties between equal sort values so pages are deterministic
+        ordering = tuple(super().get_ordering(request, queryset, view))
+        if not {'id', '-id'} & set(ordering):
+            ordering += ('-id',)
+        return ordering
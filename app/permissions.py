@@ -0,0 +1,15 @@
+# app/permissions.py
+from rest_framework.permissions import BasePermission, SAFE_METHODS
+
+
+class IsSellerOrReadOnly(BasePermission):
+    """
+    Allow read-only requests from anyone, writes only from sellers.
+    Checked before the request body is parsed or validated.
+    """
+    message = "Only sellers can create products. Set is_seller=true in your profile."
+    
+    def has_permission(self, request, view):
+        return request.method in SAFE_METHODS or (
+            request.user.is_authenticated and request.user.is_seller
+        )
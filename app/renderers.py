@@ -0,0 +1,19 @@
+# app/renderers.py
+import orjson
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer backed by orjson, which encodes straight to bytes in C.
+    
+    Types orjson can't encode natively (Decimal, lazy strings, ...) fall
+    back to DRF's own encoder, so responses keep the same shape.
+    """
+    fallback_encoder = JSONEncoder()
+    
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return orjson.dumps(data, default=self.fallback_encoder.default)
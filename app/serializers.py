@@ -4,6 +4,10 @@ Serializers for authentication
 from rest_framework import serializers
 from django.contrib.auth import get_user_model, authenticate
 from django.contrib.auth.password_validation import validate_password
+from django.contrib.postgres.expressions import ArraySubquery
+from django.db import connections
+from django.db.models import Count, OuterRef, Prefetch, Subquery
+from django.db.models.functions import Coalesce
 from .models import Category, Product
 
 User = get_user_model()
@@ -62,7 +66,12 @@ class LoginSerializer(serializers.Serializer):
 
 class CategorySerializer(serializers.ModelSerializer):
     """Category serializer"""
-    product_count = serializers.SerializerMethodField()
+    # Annotated by setup_eager_loading. Views re-read written products
+    # through it (EagerLoadingMixin.reload_saved_instance), so only a
+    # just-created category, which has no products yet, comes without it
+    product_count = serializers.IntegerField(
+        source='active_product_count', read_only=True, default=0
+    )
     
     class Meta:
         model = Category
@@ -70,8 +79,22 @@ class CategorySerializer(serializers.ModelSerializer):
                  'is_active', 'product_count', 'created_at']
         read_only_fields = ['slug', 'created_at']
     
-    def get_product_count(self, obj):
-        return obj.products.filter(is_active=True).count()
+    # Columns the representation reads; image, display_order and
+    # updated_at are never fetched for listings
+    LIST_FIELDS = ['id', 'name', 'slug', 'description', 'parent', 'is_active', 'created_at']
+    
+    @staticmethod
+    def setup_eager_loading(queryset):
+        """Annotate active product counts in the same query as the categories"""
+        # A correlated subquery rather than Count('products'): the count must
+        # stay correct when the queryset is itself joined through products,
+        # as it is when prefetched for ProductSerializer.
+        active_products = Product.categories.through.objects.filter(
+            category=OuterRef('pk'), product__is_active=True
+        ).order_by().values('category').annotate(count=Count('pk')).values('count')
+        return queryset.annotate(
+            active_product_count=Coalesce(Subquery(active_products), 0)
+        )
 
 
 class ProductSerializer(serializers.ModelSerializer):
@@ -85,10 +108,24 @@ class ProductSerializer(serializers.ModelSerializer):
     class Meta:
         model = Product
         fields = ['id', 'name', 'slug', 'sku', 'description', 'price', 
-                 'stock_quantity', 'seller', 'seller_name', 'categories', 
+                 'compare_price', 'discount_percentage', 'stock_quantity', 
+                 'is_in_stock', 'seller', 'seller_name', 'categories', 
                  'category_ids', 'is_active', 'is_featured', 'created_at']
         read_only_fields = ['id', 'slug', 'sku', 'seller', 'created_at']
     
+    @staticmethod
+    def setup_eager_loading(queryset):
+        """Load seller and (count-annotated) categories in bulk queries"""
+        # search_vector is only read by the database, never serialized
+        return queryset.with_stock_and_discount().select_related('seller').prefetch_related(
+            Prefetch(
+                'categories',
+                queryset=CategorySerializer.setup_eager_loading(
+                    Category.objects.only(*CategorySerializer.LIST_FIELDS)
+                )
+            )
+        ).defer('search_vector')
+    
     def create(self, validated_data):
         category_ids = validated_data.pop('category_ids', [])
         validated_data['seller'] = self.context['request'].user
@@ -98,4 +135,76 @@ class ProductSerializer(serializers.ModelSerializer):
             categories = Category.objects.filter(id__in=category_ids)
             product.categories.set(categories)
         
-        return product
\ No newline at end of file
+        return product
+
+
+class PriceField(serializers.Field):
+    """Read-only money field rendering two-decimal strings without quantizing"""
+    
+    def __init__(self, **kwargs):
+        kwargs['read_only'] = True
+        super().__init__(**kwargs)
+    
+    def to_representation(self, value):
+        return f'{value:.2f}'
+
+
+class CategoryNamesField(serializers.Field):
+    """
+    Read-only list of a product's category names, taken from the
+    category_names annotation or listed_categories prefetch when present,
+    else from its categories
+    """
+    
+    def __init__(self, **kwargs):
+        kwargs['read_only'] = True
+        kwargs['source'] = '*'
+        super().__init__(**kwargs)
+    
+    def to_representation(self, product):
+        names = getattr(product, 'category_names', None)
+        if names is not None:
+            return names
+        categories = getattr(product, 'listed_categories', None)
+        if categories is None:
+            categories = product.categories.all()
+        return [category.name for category in categories]
+
+
+class ProductListSerializer(ProductSerializer):
+    """Lightweight product serializer for list pages"""
+    categories = CategoryNamesField()
+    price = PriceField()
+    compare_price = PriceField()
+    
+    class Meta(ProductSerializer.Meta):
+        fields = [f for f in ProductSerializer.Meta.fields if f != 'description']
+    
+    # Columns the list representation reads; the rest (description, SEO
+    # and specification fields) are never fetched
+    LIST_FIELDS = [
+        'id', 'name', 'slug', 'sku', 'price', 'compare_price', 'stock_quantity',
+        'seller__id', 'seller__username', 'is_active', 'is_featured', 'created_at',
+    ]
+    
+    @staticmethod
+    def setup_eager_loading(queryset):
+        """Load only listed columns, seller and category names in bulk queries"""
+        queryset = queryset.with_stock_and_discount().select_related(
+            'seller'
+        ).only(*ProductListSerializer.LIST_FIELDS)
+        
+        # PostgreSQL collects the names into an array in the same query;
+        # other databases fall back to a second, prefetch query
+        if connections[queryset.db].vendor == 'postgresql':
+            category_names = Category.objects.filter(products=OuterRef('pk')).values('name')
+            return queryset.annotate(category_names=ArraySubquery(category_names))
+        # to_attr gives each product a plain list, so serializing a row
+        # doesn't build a related manager just to read the prefetch cache
+        return queryset.prefetch_related(
+            Prefetch(
+                'categories',
+                queryset=Category.objects.only('id', 'name'),
+                to_attr='listed_categories',
+            )
+        )
@@ -0,0 +1,21 @@
+"""
+Signal handlers for ALX Project Nexus
+"""
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from .cache import invalidate_listing_caches
+from .models import Category, Product
+
+
+@receiver([post_save, post_delete], sender=Product)
+@receiver([post_save, post_delete], sender=Category)
+@receiver(m2m_changed, sender=Product.categories.through)
+def invalidate_product_caches(sender, **kwargs):
+    """
+    Drop cached listings whenever products or categories change.
+    
+    bulk_create() and queryset.update() bypass these signals; their
+    callers invalidate explicitly (see invalidate_listing_caches)
+    """
+    invalidate_listing_caches()
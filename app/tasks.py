@@ -0,0 +1,49 @@
+"""
+Background tasks for ALX Project Nexus
+"""
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from django.db import transaction
+from PIL import Image
+
+logger = logging.getLogger(__name__)
+
+# Small worker pool so image processing never blocks the request thread
+_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='image-resize')
+
+
+def resize_image(path, output_size):
+    """Shrink the image at path in place so it fits within output_size"""
+    img = Image.open(path)
+    if img.width <= output_size[0] and img.height <= output_size[1]:
+        return
+    
+    image_format = img.format
+    # Let libjpeg decode at a reduced scale instead of full resolution
+    img.draft('RGB', output_size)
+    img.thumbnail(output_size, Image.Resampling.LANCZOS)
+    
+    save_options = {'optimize': True}
+    if image_format == 'JPEG':
+        save_options['progressive'] = True
+    img.save(path, format=image_format, **save_options)
+
+
+def _log_resize_failure(path, future):
+    """Log a background resize that raised; nothing else reads its future"""
+    exc = future.exception()
+    if exc is not None:
+        logger.error('Resizing image %s failed', path, exc_info=exc)
+
+
+def _submit_resize(path, output_size):
+    future = _executor.submit(resize_image, path, output_size)
+    future.add_done_callback(partial(_log_resize_failure, path))
+    return future
+
+
+def resize_image_later(path, output_size):
+    """Resize the image in the background once the transaction commits"""
+    transaction.on_commit(lambda: _submit_resize(path, output_size))
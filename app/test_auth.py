@@ -1,22 +1,22 @@
 """
 Authentication tests for ALX Project Nexus E-Commerce Backend
 """
-from django.test import TestCase
 from django.contrib.auth import get_user_model
-from rest_framework.test import APIClient
+from rest_framework.test import APITestCase
 from rest_framework import status
 from django.urls import reverse
+from app.serializers import LoginSerializer, RegisterSerializer
 
 User = get_user_model()
 
 
-class AuthTestCase(TestCase):
+class AuthTestCase(APITestCase):
     """Test authentication functionality"""
     
-    def setUp(self):
-        """Set up test data"""
-        self.client = APIClient()
-        self.user_data = {
+    @classmethod
+    def setUpTestData(cls):
+        """Set up test data once for the whole class"""
+        cls.user_data = {
             'username': 'testuser',
             'email': 'test@example.com',
             'password': 'testpass123',
@@ -25,7 +25,7 @@ class AuthTestCase(TestCase):
         }
         
         # Create existing user for login tests
-        self.existing_user = User.objects.create_user(
+        cls.existing_user = User.objects.create_user(
             username='existing',
             email='existing@example.com',
             password='existingpass123'
@@ -36,18 +36,20 @@ class AuthTestCase(TestCase):
         response = self.client.post('/api/auth/register/', self.user_data)
         
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
-        self.assertIn('user', response.data)
-        self.assertIn('tokens', response.data)
-        self.assertEqual(response.data['user']['username'], 'testuser')
+        data = response.json()
+        self.assertIn('user', data)
+        self.assertIn('tokens', data)
+        self.assertEqual(data['user']['username'], 'testuser')
     
     def test_register_password_mismatch(self):
         """Test registration with password mismatch"""
         data = self.user_data.copy()
         data['password_confirm'] = 'different'
         
-        response = self.client.post('/api/auth/register/', data)
+        serializer = RegisterSerializer(data=data)
         
-        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(serializer.is_valid())
+        self.assertIn('non_field_errors', serializer.errors)
     
     def test_login_success(self):
         """Test successful login"""
@@ -59,8 +61,9 @@ class AuthTestCase(TestCase):
         response = self.client.post('/api/auth/login/', login_data)
         
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertIn('tokens', response.data)
-        self.assertIn('user', response.data)
+        data = response.json()
+        self.assertIn('tokens', data)
+        self.assertIn('user', data)
     
     def test_login_invalid_credentials(self):
         """Test login with wrong password"""
@@ -69,9 +72,10 @@ class AuthTestCase(TestCase):
             'password': 'wrongpassword'
         }
         
-        response = self.client.post('/api/auth/login/', login_data)
+        serializer = LoginSerializer(data=login_data)
         
-        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(serializer.is_valid())
+        self.assertIn('non_field_errors', serializer.errors)
     
     def test_profile_authenticated(self):
         """Test getting profile when authenticated"""
@@ -80,7 +84,7 @@ class AuthTestCase(TestCase):
             'username': 'existing',
             'password': 'existingpass123'
         })
-        token = login_response.data['tokens']['access']
+        token = login_response.json()['tokens']['access']
         
         # Use token to get profile
         self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
@@ -1,59 +1,68 @@
 """
 Category tests for ALX Project Nexus E-Commerce Backend
 """
-from django.test import TestCase
+from unittest import mock
+from django.core.cache import cache
+from django.db import transaction
+from django.test import TransactionTestCase, override_settings
 from django.contrib.auth import get_user_model
-from rest_framework.test import APIClient
+from rest_framework.test import APIClient, APITestCase
 from rest_framework import status
-from app.models import Category
+from rest_framework_simplejwt.tokens import RefreshToken
+from app import models
+from app.cache import CATEGORY_LIST_CACHE_TIMEOUT, LIST_CACHE_TIMEOUT
+from app.models import Category, Product
+from app.views import CategoryListView
 
 User = get_user_model()
 
 
-class CategoryTestCase(TestCase):
+class CategoryTestCase(APITestCase):
     """Test category functionality"""
     
-    def setUp(self):
-        """Set up test data"""
-        self.client = APIClient()
-        self.user = User.objects.create_user(
+    @classmethod
+    def setUpTestData(cls):
+        """Set up test data once for the whole class"""
+        cls.user = User.objects.create_user(
             username='testuser',
             password='testpass123'
         )
         
-        self.category = Category.objects.create(
+        cls.category = Category.objects.create(
             name='Electronics',
             description='Electronic devices'
         )
+        
+        # Issue the token directly rather than logging in through the API
+        cls.token = str(RefreshToken.for_user(cls.user).access_token)
+    
+    def setUp(self):
+        """Fresh product cache and an authenticated client for each test"""
+        cache.clear()
+        self.auth_client = APIClient()
+        self.auth_client.credentials(HTTP_AUTHORIZATION=f'Bearer {self.token}')
     
     def test_list_categories_public(self):
         """Test anyone can view categories"""
         response = self.client.get('/api/categories/')
         
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(response.data['count'], 1)
-        self.assertEqual(response.data['results'][0]['name'], 'Electronics')
+        self.assertEqual(response.json()['count'], 1)
+        self.assertEqual(response.json()['results'][0]['name'], 'Electronics')
     
     def test_create_category_authenticated(self):
         """Test authenticated user can create category"""
-        # Login first
-        login_response = self.client.post('/api/auth/login/', {
-            'username': 'testuser',
-            'password': 'testpass123'
-        })
-        token = login_response.data['tokens']['access']
-        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
-        
         data = {
             'name': 'Books',
             'description': 'Books and education'
         }
         
-        response = self.client.post('/api/categories/', data)
+        response = self.auth_client.post('/api/categories/', data)
         
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
-        self.assertEqual(response.data['name'], 'Books')
-        self.assertEqual(response.data['slug'], 'books')
+        self.assertEqual(response.json()['name'], 'Books')
+        self.assertEqual(response.json()['slug'], 'books')
+        self.assertEqual(response.json()['product_count'], 0)
     
     def test_create_category_unauthenticated_fails(self):
         """Test unauthenticated user cannot create category"""
@@ -66,9 +75,118 @@ class CategoryTestCase(TestCase):
         
         self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
     
+    def test_list_categories_product_count(self):
+        """Test product_count only counts active products"""
+        seller = User.objects.create_user(username='seller', password='sellerpass123')
+        active = Product.objects.create(
+            name='Laptop', description='A laptop', price='999.99', seller=seller
+        )
+        inactive = Product.objects.create(
+            name='Old Laptop', description='Retired', price='99.99',
+            seller=seller, is_active=False
+        )
+        self.category.products.add(active, inactive)
+        
+        response = self.client.get('/api/categories/')
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()['results'][0]['product_count'], 1)
+    
+    def test_list_categories_query_count(self):
+        """Test category list does not issue queries per category"""
+        for name in ['Books', 'Toys', 'Garden']:
+            Category.objects.create(name=name)
+        
+        # count, then categories with their annotated product counts
+        with self.assertNumQueries(2):
+            response = self.client.get('/api/categories/')
+        
+        self.assertEqual(response.json()['count'], 4)
+    
+    def test_get_product_count_includes_subcategories(self):
+        """Test product count covers the whole subcategory tree"""
+        seller = User.objects.create_user(username='seller', password='sellerpass123')
+        phones = Category.objects.create(name='Phones', parent=self.category)
+        smartphones = Category.objects.create(name='Smartphones', parent=phones)
+        
+        laptop = Product.objects.create(
+            name='Laptop', description='A laptop', price='999.99', seller=seller
+        )
+        iphone = Product.objects.create(
+            name='iPhone', description='A phone', price='1999.99', seller=seller
+        )
+        laptop.categories.add(self.category)
+        iphone.categories.add(phones, smartphones)
+        
+        self.assertEqual(self.category.get_all_children(), [phones, smartphones])
+        self.assertEqual(self.category.get_product_count(), 2)
+        self.assertEqual(smartphones.get_product_count(), 1)
+    
+    def test_filter_has_products(self):
+        """Test filtering categories by whether they have products"""
+        seller = User.objects.create_user(username='seller', password='sellerpass123')
+        product = Product.objects.create(
+            name='Laptop', description='A laptop', price='999.99', seller=seller
+        )
+        product.categories.add(self.category)
+        Category.objects.create(name='Books', description='Books and education')
+        
+        response = self.client.get('/api/categories/?has_products=true')
+        self.assertEqual([c['name'] for c in response.json()['results']], ['Electronics'])
+        
+        response = self.client.get('/api/categories/?has_products=false')
+        self.assertEqual([c['name'] for c in response.json()['results']], ['Books'])
+    
+    def test_list_categories_cached_until_change(self):
+        """Test repeated category listings are served from cache"""
+        self.client.get('/api/categories/')
+        
+        with self.assertNumQueries(0):
+            response = self.client.get('/api/categories/')
+        self.assertEqual(response.json()['count'], 1)
+        
+        Category.objects.create(name='Books', description='Books and education')
+        response = self.client.get('/api/categories/')
+        self.assertEqual(response.json()['count'], 2)
+    
+    def test_list_categories_cache_timeout(self):
+        """Test category listings are cached long only on a shared cache"""
+        # The test cache is per-process LocMem
+        self.assertEqual(CategoryListView().get_cache_timeout(), LIST_CACHE_TIMEOUT)
+        
+        redis = {'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': 'redis://localhost:6379',
+        }}
+        with override_settings(CACHES=redis):
+            self.assertEqual(CategoryListView().get_cache_timeout(), CATEGORY_LIST_CACHE_TIMEOUT)
+    
     def test_search_categories(self):
         """Test category search"""
         response = self.client.get('/api/categories/?search=electronic')
         
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(response.data['count'], 1)
\ No newline at end of file
+        self.assertEqual(response.json()['count'], 1)
+
+class CategorySlugTransactionTestCase(TransactionTestCase):
+    """Test slug generation outside a test transaction (autocommit)"""
+    
+    def test_clashing_slug_resolved_in_autocommit(self):
+        """Test a slug clash is resolved without opening a transaction"""
+        Category.objects.create(name='Home Garden')
+        
+        with mock.patch.object(models, 'transaction', wraps=transaction) as wrapped:
+            category = Category.objects.create(name='Home & Garden')
+        
+        self.assertEqual(category.slug, 'home-garden-1')
+        wrapped.atomic.assert_not_called()
+    
+    def test_clashing_slug_resolved_in_transaction(self):
+        """Test a slug clash inside a transaction leaves it usable"""
+        with transaction.atomic():
+            Category.objects.create(name='Home Garden')
+            category = Category.objects.create(name='Home & Garden')
+            Category.objects.create(name='Books')
+        
+        self.assertEqual(category.slug, 'home-garden-1')
+        self.assertEqual(Category.objects.count(), 3)
@@ -1,71 +1,101 @@
 """
 Product tests for ALX Project Nexus E-Commerce Backend
 """
-from django.test import TestCase
+import json
+import warnings
+from io import StringIO
+from unittest import mock
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import DatabaseError, connection, transaction
+from django.utils.text import slugify
+from django.test import TransactionTestCase, override_settings
+from django.contrib import admin
 from django.contrib.auth import get_user_model
-from rest_framework.test import APIClient
+from rest_framework.test import APITestCase
 from rest_framework import status
+from rest_framework_simplejwt.tokens import RefreshToken
+from app import models
+from app.admin import ProductAdmin
+from app.cache import (
+    DIRTY_PRODUCTS_RELOG_EVERY, DIRTY_PRODUCTS_SEQ_KEY, DIRTY_PRODUCTS_SLOT_KEY,
+    buffer_product_view,
+)
+from app.checks import check_view_count_buffer_cache
 from app.models import Category, Product
 
 User = get_user_model()
 
 
-class ProductTestCase(TestCase):
+class ProductTestCase(APITestCase):
     """Test product functionality"""
     
-    def setUp(self):
-        """Set up test data"""
-        self.client = APIClient()
-        
+    @classmethod
+    def setUpTestData(cls):
+        """Set up test data once for the whole class"""
         # Create users
-        self.seller = User.objects.create_user(
+        cls.seller = User.objects.create_user(
             username='seller',
             password='sellerpass123',
             is_seller=True
         )
-        self.regular_user = User.objects.create_user(
+        cls.regular_user = User.objects.create_user(
             username='buyer',
             password='buyerpass123',
             is_seller=False
         )
         
         # Create category
-        self.category = Category.objects.create(
+        cls.category = Category.objects.create(
             name='Electronics',
             description='Electronic devices'
         )
         
         # Create product
-        self.product = Product.objects.create(
+        cls.product = Product.objects.create(
             name='iPhone 15',
             description='Latest iPhone',
             price='15999.99',
             stock_quantity=10,
-            seller=self.seller,
+            seller=cls.seller,
             is_featured=True
         )
-        self.product.categories.add(self.category)
+        cls.product.categories.add(cls.category)
+        
+        # Mint tokens directly instead of logging in through the API
+        cls.seller_token = str(RefreshToken.for_user(cls.seller).access_token)
+        cls.regular_user_token = str(RefreshToken.for_user(cls.regular_user).access_token)
     
-    def get_token(self, user):
-        """Helper to get auth token"""
-        response = self.client.post('/api/auth/login/', {
-            'username': user.username,
-            'password': f'{user.username}pass123'
-        })
-        return response.data['tokens']['access']
+    def setUp(self):
+        """Fresh product cache for each test"""
+        cache.clear()
+    
+    def test_duplicate_names_get_unique_slug_and_sku(self):
+        """Test slug and SKU are made unique on save"""
+        first = Product.objects.create(
+            name='iPhone 15', description='Refurbished', price='9999.99', seller=self.seller
+        )
+        second = Product.objects.create(
+            name='iPhone 15', description='Used', price='7999.99', seller=self.seller
+        )
+        
+        self.assertEqual(self.product.slug, 'iphone-15')
+        self.assertEqual(first.slug, 'iphone-15-1')
+        self.assertEqual(second.slug, 'iphone-15-2')
+        self.assertEqual(len({self.product.sku, first.sku, second.sku}), 3)
+        self.assertTrue(first.sku.startswith('IPH-'))
     
     def test_list_products_public(self):
         """Test anyone can view products"""
         response = self.client.get('/api/products/')
         
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(response.data['count'], 1)
-        self.assertEqual(response.data['results'][0]['name'], 'iPhone 15')
+        self.assertEqual(len(response.json()['results']), 1)
+        self.assertEqual(response.json()['results'][0]['name'], 'iPhone 15')
     
     def test_create_product_as_seller(self):
         """Test seller can create product"""
-        token = self.get_token(self.seller)
-        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {self.seller_token}')
         
         data = {
             'name': 'New Product',
@@ -78,13 +108,17 @@ class ProductTestCase(TestCase):
         response = self.client.post('/api/products/', data)
         
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
-        self.assertEqual(response.data['name'], 'New Product')
-        self.assertEqual(response.data['seller'], self.seller.id)
+        self.assertEqual(response.json()['name'], 'New Product')
+        self.assertEqual(response.json()['seller'], self.seller.id)
+        # Nested categories carry their active product counts, as on reads
+        self.assertEqual(
+            response.json()['categories'][0]['product_count'],
+            self.category.products.filter(is_active=True).count(),
+        )
     
     def test_create_product_as_regular_user_fails(self):
         """Test regular user cannot create product"""
-        token = self.get_token(self.regular_user)
-        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {self.regular_user_token}')
         
         data = {
             'name': 'New Product',
@@ -97,48 +131,366 @@ class ProductTestCase(TestCase):
         
         self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
     
+    def test_create_product_unauthenticated(self):
+        """Test anonymous users are asked to authenticate before creating"""
+        response = self.client.post('/api/products/', {'name': 'New Product'})
+        
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+    
+    def test_list_products_query_count(self):
+        """Test product list does not issue queries per product"""
+        books = Category.objects.create(name='Books', description='Books')
+        for i in range(3):
+            product = Product.objects.create(
+                name=f'Product {i}', description='Bulk', price='10.00', seller=self.seller
+            )
+            product.categories.add(self.category, books)
+        
+        # products joined with seller, then category names (folded into the
+        # product query on PostgreSQL); cursor pagination runs no COUNT
+        with self.assertNumQueries(1 if connection.vendor == 'postgresql' else 2):
+            response = self.client.get('/api/products/')
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.json()['results']), 4)
+        self.assertEqual(response.json()['results'][0]['categories'], ['Books', 'Electronics'])
+    
+    def test_list_products_cursor_pagination(self):
+        """Test following next links visits every product exactly once"""
+        Product.objects.bulk_create([
+            Product(
+                name=f'Product {i}', slug=f'product-{i}', sku=Product.generate_sku('Product'),
+                description='Bulk', price='10.00', seller=self.seller
+            )
+            for i in range(25)
+        ])
+        
+        slugs = []
+        url = '/api/products/?ordering=price'
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertNotIn('count', response.json())
+            slugs.extend(p['slug'] for p in response.json()['results'])
+            url = response.json()['next']
+        
+        self.assertEqual(len(slugs), 26)
+        self.assertEqual(len(set(slugs)), 26)
+    
+    def test_list_products_stream(self):
+        """Test ?stream=1 returns every filtered product as NDJSON"""
+        Product.objects.create(
+            name='Galaxy S24', description='Android', price='12999.99', seller=self.seller
+        )
+        
+        response = self.client.get('/api/products/?stream=1&ordering=price')
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        rows = [json.loads(line) for line in b''.join(response.streaming_content).splitlines()]
+        self.assertEqual([row['name'] for row in rows], ['Galaxy S24', 'iPhone 15'])
+        self.assertEqual(rows[0]['categories'], [])
+    
+    async def test_list_products_stream_asgi(self):
+        """Test ?stream=1 under ASGI streams without buffering the catalog"""
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always')
+            response = await self.async_client.get('/api/products/?stream=1')
+            # Iterated the way Django's ASGI handler sends it
+            content = b''.join([chunk async for chunk in response])
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.is_async)
+        self.assertEqual([json.loads(line)['name'] for line in content.splitlines()], ['iPhone 15'])
+        self.assertEqual(
+            [str(w.message) for w in caught if 'StreamingHttpResponse' in str(w.message)], []
+        )
+    
+    def test_list_products_cached_until_change(self):
+        """Test repeated product listings are served from cache"""
+        self.client.get('/api/products/?ordering=price&in_stock=true')
+        
+        with self.assertNumQueries(0):
+            response = self.client.get('/api/products/?in_stock=true&ordering=price')
+        self.assertEqual(len(response.json()['results']), 1)
+        
+        Product.objects.create(
+            name='Cheap Phone', description='Budget', price='99.99',
+            stock_quantity=5, seller=self.seller
+        )
+        response = self.client.get('/api/products/?in_stock=true&ordering=price')
+        self.assertEqual(len(response.json()['results']), 2)
+    
+    def test_list_products_cache_dropped_by_admin_bulk_action(self):
+        """Test admin bulk updates, which send no signals, invalidate listings"""
+        self.assertEqual(len(self.client.get('/api/products/').json()['results']), 1)
+        
+        product_admin = ProductAdmin(Product, admin.site)
+        with mock.patch.object(product_admin, 'message_user'):
+            product_admin.make_inactive(None, Product.objects.filter(pk=self.product.pk))
+        
+        self.assertEqual(len(self.client.get('/api/products/').json()['results']), 0)
+    
+    def test_product_detail_increments_view_count(self):
+        """Test viewing a product increments its view count"""
+        response = self.client.get(f'/api/products/{self.product.slug}/')
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()['name'], 'iPhone 15')
+        self.product.refresh_from_db()
+        self.assertEqual(self.product.view_count, 1)
+    
+    def test_product_detail_query_count(self):
+        """Test product detail loads seller and categories eagerly"""
+        # product joined with seller, categories with counts, view count
+        with self.assertNumQueries(3):
+            response = self.client.get(f'/api/products/{self.product.slug}/')
+        
+        self.assertEqual(response.json()['categories'][0]['name'], self.category.name)
+    
+    def test_stock_and_discount_annotations(self):
+        """Test database-computed stock/discount match the model properties"""
+        discounted = Product.objects.create(
+            name='Old Phone', description='Discounted', price='75.00',
+            compare_price='100.00', stock_quantity=0, seller=self.seller
+        )
+        discounted.refresh_from_db()
+        annotated = Product.objects.with_stock_and_discount().get(pk=discounted.pk)
+        
+        self.assertFalse(annotated.is_in_stock)
+        self.assertEqual(annotated.discount_percentage, discounted.discount_percentage)
+        self.assertEqual(float(annotated.discount_percentage), 25.0)
+        
+        response = self.client.get('/api/products/')
+        results = {p['name']: p for p in response.json()['results']}
+        self.assertTrue(results['iPhone 15']['is_in_stock'])
+        self.assertEqual(float(results['iPhone 15']['discount_percentage']), 0)
+        self.assertFalse(results['Old Phone']['is_in_stock'])
+    
+    def test_update_product(self):
+        """Test product update through the detail endpoint"""
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {self.seller_token}')
+        
+        response = self.client.patch(
+            f'/api/products/{self.product.slug}/', {'price': '14999.99'}, format='json'
+        )
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()['price'], '14999.99')
+        self.product.refresh_from_db()
+        self.assertEqual(str(self.product.price), '14999.99')
+        self.assertEqual(self.product.description, 'Latest iPhone')
+    
+    def test_update_product_recomputes_stock_and_discount(self):
+        """Test the update response reflects the new price and stock"""
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {self.seller_token}')
+        Product.objects.filter(pk=self.product.pk).update(price='100.00', compare_price='200.00')
+        
+        response = self.client.patch(
+            f'/api/products/{self.product.slug}/',
+            {'price': '150.00', 'stock_quantity': 0},
+            format='json'
+        )
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(float(response.json()['discount_percentage']), 25.0)
+        self.assertFalse(response.json()['is_in_stock'])
+        
+        # The model recomputes on save without needing a re-read
+        product = Product.objects.with_stock_and_discount().get(pk=self.product.pk)
+        product.price = 200
+        product.save()
+        self.assertEqual(product.discount_percentage, 0)
+    
+    def test_update_product_keeps_category_counts(self):
+        """Test partial updates still return nested category product counts"""
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {self.seller_token}')
+        
+        response = self.client.patch(
+            f'/api/products/{self.product.slug}/', {'price': '14999.99'}, format='json'
+        )
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()['categories'][0]['product_count'], 1)
+    
+    @override_settings(BUFFER_PRODUCT_VIEW_COUNTS=True)
+    def test_buffered_view_counts_are_flushed(self):
+        """Test buffered product views reach the database on flush"""
+        other = Product.objects.create(
+            name='Galaxy S24', description='Android', price='12999.99', seller=self.seller
+        )
+        for _ in range(3):
+            self.client.get(f'/api/products/{self.product.slug}/')
+        self.client.get(f'/api/products/{other.slug}/')
+        self.product.refresh_from_db()
+        self.assertEqual(self.product.view_count, 0)
+        # Pending views are counted on the instance being viewed
+        self.product.increment_view_count()
+        self.assertEqual(self.product.view_count, 4)
+        
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command('flush_view_counts', stdout=StringIO())
+        
+        self.product.refresh_from_db()
+        other.refresh_from_db()
+        self.assertEqual(self.product.view_count, 4)
+        self.assertEqual(other.view_count, 1)
+        
+        # Flushed views leave the buffer; later views are flushed once
+        self.client.get(f'/api/products/{other.slug}/')
+        for _ in range(2):
+            with self.captureOnCommitCallbacks(execute=True):
+                call_command('flush_view_counts', stdout=StringIO())
+        self.product.refresh_from_db()
+        other.refresh_from_db()
+        self.assertEqual(self.product.view_count, 4)
+        self.assertEqual(other.view_count, 2)
+    
+    @override_settings(BUFFER_PRODUCT_VIEW_COUNTS=True)
+    def test_buffered_view_counts_relogged_after_lost_entry(self):
+        """Test a product whose dirty-log entry was evicted is logged again"""
+        for _ in range(DIRTY_PRODUCTS_RELOG_EVERY - 1):
+            buffer_product_view(self.product.pk)
+        # Lose every dirty-log entry, as an eviction would
+        cache.delete_many([
+            DIRTY_PRODUCTS_SLOT_KEY.format(slot)
+            for slot in range(1, cache.get(DIRTY_PRODUCTS_SEQ_KEY) + 1)
+        ])
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command('flush_view_counts', stdout=StringIO())
+        
+        buffer_product_view(self.product.pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command('flush_view_counts', stdout=StringIO())
+        
+        self.product.refresh_from_db()
+        self.assertEqual(self.product.view_count, DIRTY_PRODUCTS_RELOG_EVERY)
+    
+    def test_buffered_view_counts_need_shared_cache(self):
+        """Test buffering on a process-local cache fails the system checks"""
+        with override_settings(BUFFER_PRODUCT_VIEW_COUNTS=True):
+            self.assertEqual(
+                [error.id for error in check_view_count_buffer_cache(None)], ['app.E001']
+            )
+        
+        redis = {'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': 'redis://localhost:6379',
+        }}
+        with override_settings(BUFFER_PRODUCT_VIEW_COUNTS=True, CACHES=redis):
+            self.assertEqual(check_view_count_buffer_cache(None), [])
+    
+    @override_settings(BUFFER_PRODUCT_VIEW_COUNTS=True)
+    def test_buffered_view_counts_survive_failed_flush(self):
+        """Test views stay buffered until a flush writing them commits"""
+        self.client.get(f'/api/products/{self.product.slug}/')
+        
+        # Two failed runs in a row leave the product logged for the next
+        for _ in range(2):
+            with mock.patch('django.db.models.query.QuerySet.update', side_effect=DatabaseError):
+                with self.assertRaises(DatabaseError):
+                    call_command('flush_view_counts', stdout=StringIO())
+        # Nor does a run inside a transaction that is then rolled back
+        with self.assertRaises(DatabaseError):
+            with transaction.atomic():
+                call_command('flush_view_counts', stdout=StringIO())
+                raise DatabaseError
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command('flush_view_counts', stdout=StringIO())
+        
+        self.product.refresh_from_db()
+        self.assertEqual(self.product.view_count, 1)
+    
     def test_search_products(self):
         """Test product search"""
         response = self.client.get('/api/products/?search=iphone')
         
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(response.data['count'], 1)
-        self.assertEqual(response.data['results'][0]['name'], 'iPhone 15')
+        self.assertEqual(len(response.json()['results']), 1)
+        self.assertEqual(response.json()['results'][0]['name'], 'iPhone 15')
+    
+    def test_full_text_search(self):
+        """Test full-text search over name and description"""
+        response = self.client.get('/api/products/?q=latest')
+        self.assertEqual(len(response.json()['results']), 1)
+        
+        response = self.client.get('/api/products/?q=android')
+        self.assertEqual(len(response.json()['results']), 0)
+        
+        # ?q= is an alias of ?search=, including the SKU prefix match
+        prefix = self.product.sku[:4]
+        for param in ('search', 'q'):
+            response = self.client.get(f'/api/products/?{param}={prefix}')
+            self.assertEqual(len(response.json()['results']), 1)
     
     def test_filter_by_price(self):
         """Test price filtering"""
         # Should find iPhone (expensive)
         response = self.client.get('/api/products/?min_price=10000')
-        self.assertEqual(response.data['count'], 1)
+        self.assertEqual(len(response.json()['results']), 1)
         
         # Should find nothing (too expensive)
         response = self.client.get('/api/products/?max_price=100')
-        self.assertEqual(response.data['count'], 0)
+        self.assertEqual(len(response.json()['results']), 0)
     
     def test_filter_featured(self):
         """Test featured products filter"""
         response = self.client.get('/api/products/?is_featured=true')
         
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(response.data['count'], 1)
-        self.assertEqual(response.data['results'][0]['name'], 'iPhone 15')
+        self.assertEqual(len(response.json()['results']), 1)
+        self.assertEqual(response.json()['results'][0]['name'], 'iPhone 15')
     
     def test_sort_by_price(self):
         """Test sorting by price"""
-        # Create cheaper product
-        Product.objects.create(
-            name='Cheap Phone',
-            price='99.99',
-            stock_quantity=5,
-            seller=self.seller
-        )
+        # Seed products in one INSERT; bulk_create skips save(), so the
+        # slug and SKU are set here
+        Product.objects.bulk_create([
+            Product(
+                name=name,
+                slug=slugify(name),
+                sku=Product.generate_sku(name),
+                price=price,
+                stock_quantity=5,
+                seller=self.seller
+            )
+            for name, price in [
+                ('Cheap Phone', '99.99'),
+                ('Mid Phone', '4999.99'),
+                ('Premium Phone', '24999.99'),
+            ]
+        ])
         
         # Sort ascending
         response = self.client.get('/api/products/?ordering=price')
-        prices = [float(p['price']) for p in response.data['results']]
+        prices = [float(p['price']) for p in response.json()['results']]
         self.assertEqual(prices, sorted(prices))
         
         # Sort descending  
         response = self.client.get('/api/products/?ordering=-price')
-        prices = [float(p['price']) for p in response.data['results']]
-        self.assertEqual(prices, sorted(prices, reverse=True))
\ No newline at end of file
+        prices = [float(p['price']) for p in response.json()['results']]
+        self.assertEqual(prices, sorted(prices, reverse=True))
+    
+    def test_unindexed_ordering_rejected(self):
+        """Test ordering by a field outside ordering_fields returns 400"""
+        response = self.client.get('/api/products/?ordering=-description')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('ordering', response.json())
+        
+        response = self.client.get('/api/products/?ordering=-view_count')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class ProductSlugTransactionTestCase(TransactionTestCase):
+    """Test slug and SKU generation outside a test transaction (autocommit)"""
+    
+    def test_clashing_slug_resolved_in_autocommit(self):
+        """Test a slug clash is resolved without opening a transaction"""
+        seller = User.objects.create_user(username='seller', password='sellerpass123')
+        Product.objects.create(name='iPhone 15', price='15999.99', seller=seller)
+        
+        with mock.patch.object(models, 'transaction', wraps=transaction) as wrapped:
+            product = Product.objects.create(name='iPhone 15', price='9999.99', seller=seller)
+        
+        self.assertEqual(product.slug, 'iphone-15-1')
+        wrapped.atomic.assert_not_called()
@@ -0,0 +1,68 @@
+"""
+Background task tests for ALX Project Nexus E-Commerce Backend
+"""
+import shutil
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from unittest import mock
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from PIL import Image
+from app import tasks
+from app.models import Product, ProductImage
+
+User = get_user_model()
+
+
+def make_image(size, name='photo.jpg'):
+    """Return an uploaded JPEG of the given size"""
+    buffer = BytesIO()
+    Image.new('RGB', size, 'red').save(buffer, format='JPEG')
+    return SimpleUploadedFile(name, buffer.getvalue(), content_type='image/jpeg')
+
+
+class ImageResizeTestCase(TestCase):
+    """Test uploaded images are resized in the background"""
+    
+    @classmethod
+    def setUpTestData(cls):
+        seller = User.objects.create_user(
+            username='seller', password='sellerpass123', is_seller=True
+        )
+        cls.product = Product.objects.create(
+            name='iPhone 15', description='Latest iPhone', price='15999.99', seller=seller
+        )
+    
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        media = override_settings(MEDIA_ROOT=media_root)
+        media.enable()
+        self.addCleanup(media.disable)
+        # A private pool, so the test can wait for the work it submits
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        executor = mock.patch.object(tasks, '_executor', self.executor)
+        executor.start()
+        self.addCleanup(executor.stop)
+    
+    def test_product_image_resized_after_commit(self):
+        """Test an oversized product image is shrunk once the save commits"""
+        with self.captureOnCommitCallbacks(execute=True):
+            image = ProductImage.objects.create(
+                product=self.product, image=make_image((1600, 1200))
+            )
+        self.executor.shutdown(wait=True)
+        
+        with Image.open(image.image.path) as stored:
+            self.assertEqual(stored.size, (800, 600))
+    
+    def test_resize_failure_is_logged(self):
+        """Test an error raised in the worker is logged, not swallowed"""
+        with self.assertLogs('app.tasks', level='ERROR') as logs:
+            with self.captureOnCommitCallbacks(execute=True):
+                tasks.resize_image_later('/nonexistent/photo.jpg', (800, 800))
+            self.executor.shutdown(wait=True)
+        
+        self.assertIn('/nonexistent/photo.jpg', logs.output[0])
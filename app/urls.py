@@ -3,8 +3,6 @@ URLs for the app
 """
 from django.urls import path
 from rest_framework_simplejwt.views import TokenRefreshView
-from rest_framework.routers import DefaultRouter
-from . import views
 from . import views
 
 # API endpoints
@@ -26,11 +24,3 @@ urlpatterns = [
     path('products/', views.ProductListView.as_view(), name='product-list'),
     path('products/<slug:slug>/', views.ProductDetailView.as_view(), name='product-detail'),
 ]
-
-# We might use routers for ViewSets later
-router = DefaultRouter()
-# router.register('products', ProductViewSet)
-# router.register('categories', CategoryViewSet)
-
-urlpatterns += router.urls
-
@@ -1,28 +1,101 @@
 """
 documented API Views for ALX Project Nexus E-Commerce Backend
 """
+from itertools import islice
+
+from adrf import generics as async_generics
+from adrf.views import APIView as AsyncAPIView
+from asgiref.sync import sync_to_async
 from rest_framework import generics, status, filters
 from rest_framework.decorators import api_view, permission_classes
-from rest_framework.permissions import AllowAny, IsAuthenticated
-from rest_framework.response import Response
-from rest_framework.views import APIView
+from rest_framework.permissions import AllowAny, IsAuthenticated, SAFE_METHODS
 from rest_framework_simplejwt.tokens import RefreshToken
-from django_filters.rest_framework import DjangoFilterBackend
-from django.contrib.auth import get_user_model, models
-from django.http import JsonResponse
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.handlers.asgi import ASGIRequest
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
+from django.views.decorators.cache import cache_page
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
 
 from .serializers import (
     UserSerializer, RegisterSerializer, LoginSerializer,
-    CategorySerializer, ProductSerializer
+    CategorySerializer, ProductSerializer, ProductListSerializer
 )
 from .models import Category, Product
-from .filters import ProductFilter, CategoryFilter
+from .cache import (
+    CATEGORY_LIST_CACHE, CATEGORY_LIST_CACHE_TIMEOUT, LIST_CACHE_TIMEOUT,
+    PRODUCT_LIST_CACHE, ROOT_CACHE_TIMEOUT, cache_is_shared, request_cache_key
+)
+from .pagination import ProductCursorPagination
+from .permissions import IsSellerOrReadOnly
+from .renderers import ORJSONRenderer
+from .filters import (
+    ProductFilter, CategoryFilter, LazyDjangoFilterBackend, ProductSearchFilter,
+    StrictOrderingFilter,
+)
 
 User = get_user_model()
 
+# The home and API root documents never change, so they are encoded once
+# at import and returned as-is, skipping serialization and rendering
+_HOME_BYTES = JsonResponse({
+    "project": "ALX Project Nexus - E-Commerce Backend",
+    "message": "Welcome! Visit /swagger/ for API documentation",
+    "available_urls": {
+        "admin": "/admin/",
+        "swagger": "/swagger/",
+        "redoc": "/redoc/",
+        "api": "/api/"
+    }
+}).content
+
+_API_ROOT_BYTES = ORJSONRenderer().render({
+    "message": "ALX Project Nexus - E-Commerce API",
+    "version": "1.0.0",
+    "documentation": "/swagger/",
+    "endpoints": {
+        "authentication": {
+            "register": "/api/auth/register/",
+            "login": "/api/auth/login/", 
+            "refresh_token": "/api/auth/refresh/",
+            "profile": "/api/auth/profile/",
+        },
+        "catalog": {
+            "categories": "/api/categories/",
+            "products": "/api/products/",
+        },
+        "filtering_examples": {
+            "search": "/api/products/?search=keyword",
+            "search_by_sku_prefix": "/api/products/?search=IPH-",
+            "search_alias": "/api/products/?q=keyword",
+            "price_range": "/api/products/?min_price=100&max_price=500",
+            "category": "/api/products/?category=1",
+            "in_stock": "/api/products/?in_stock=true",
+            "sort_by_price": "/api/products/?ordering=price",
+        }
+    }
+})
+
+
+# Register and login responses reuse one UserSerializer: a ModelSerializer
+# builds its fields for every new instance, which costs far more than
+# representing the user with fields that are already built
+_AUTH_USER_SERIALIZER = UserSerializer()
+
 
+def get_tokens_for_user(user):
+    """Issue a JWT pair for user, signing each token exactly once"""
+    refresh = RefreshToken.for_user(user)
+    # refresh.access_token builds a new token on every access
+    access = refresh.access_token
+    return {
+        'access': str(access),
+        'refresh': str(refresh)
+    }
+
+
+@cache_page(ROOT_CACHE_TIMEOUT)
 def home_view(request):
     """
     Homepage view returning project information
@@ -30,18 +103,10 @@ def home_view(request):
     Returns basic project info and navigation links
     for users visiting the root URL.
     """
-    return JsonResponse({
-        "project": "ALX Project Nexus - E-Commerce Backend",
-        "message": "Welcome! Visit /swagger/ for API documentation",
-        "available_urls": {
-            "admin": "/admin/",
-            "swagger": "/swagger/",
-            "redoc": "/redoc/",
-            "api": "/api/"
-        }
-    })
+    return HttpResponse(_HOME_BYTES, content_type="application/json")
 
 
+@cache_page(ROOT_CACHE_TIMEOUT)
 @swagger_auto_schema(
     method='get',
     operation_description="Get API overview and available endpoints",
@@ -56,38 +121,100 @@ def api_root(request):
     Provides an overview of all available API endpoints
     and their purposes. Great starting point for API exploration.
     """
-    return Response({
-        "message": "ALX Project Nexus - E-Commerce API",
-        "version": "1.0.0",
-        "documentation": "/swagger/",
-        "endpoints": {
-            "authentication": {
-                "register": "/api/auth/register/",
-                "login": "/api/auth/login/", 
-                "refresh_token": "/api/auth/refresh/",
-                "profile": "/api/auth/profile/",
-            },
-            "catalog": {
-                "categories": "/api/categories/",
-                "products": "/api/products/",
-            },
-            "filtering_examples": {
-                "search": "/api/products/?search=keyword",
-                "price_range": "/api/products/?min_price=100&max_price=500",
-                "category": "/api/products/?category=1",
-                "in_stock": "/api/products/?in_stock=true",
-                "sort_by_price": "/api/products/?ordering=price",
-            }
-        }
-    })
+    # Still an api_view for the schema docs; an HttpResponse skips rendering
+    return HttpResponse(_API_ROOT_BYTES, content_type="application/json")
+
+
+class CachedListMixin:
+    """
+    Serve list responses from cache, keyed on the query parameters.
+    
+    The rendered JSON bytes are cached, so a hit skips the database,
+    serialization and rendering alike. Listings are the same for every
+    user, so one entry serves anonymous and authenticated requests.
+    Entries are dropped by bumping cache_namespace's version (see
+    signals.py). bulk_create() and queryset.update() send no signals, so
+    code doing bulk writes calls invalidate_listing_caches() itself;
+    view_count updates are left to expire with cache_timeout.
+    
+    shared_cache_timeout, when set, replaces cache_timeout only on a cache
+    shared by every worker; a per-process cache would keep serving other
+    workers' stale entries for that long.
+    """
+    cache_namespace = None
+    cache_timeout = LIST_CACHE_TIMEOUT
+    shared_cache_timeout = None
+    
+    def get_cache_timeout(self):
+        if self.shared_cache_timeout is not None and cache_is_shared():
+            return self.shared_cache_timeout
+        return self.cache_timeout
+    
+    def list(self, request, *args, **kwargs):
+        key = request_cache_key(self.cache_namespace, request)
+        content = cache.get(key)
+        if content is None:
+            data = super().list(request, *args, **kwargs).data
+            content = ORJSONRenderer().render(data)
+            cache.set(key, content, self.get_cache_timeout())
+        return HttpResponse(content, content_type='application/json')
+
+
+class EagerLoadingMixin:
+    """
+    Apply the serializer's setup_eager_loading to the view's queryset.
+    
+    The related rows and columns loaded then always follow the serializer
+    actually in use (see get_serializer_class), instead of a hand-kept
+    list that drifts when serializer fields change.
+    """
+    
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        setup_eager_loading = getattr(self.get_serializer_class(), 'setup_eager_loading', None)
+        if setup_eager_loading is None:
+            return queryset
+        return setup_eager_loading(queryset)
+    
+    def reload_saved_instance(self, serializer):
+        """
+        Re-read serializer.instance through setup_eager_loading after a
+        write, so the response carries the same annotations and prefetches
+        as a read (nested category counts, stock and discount) instead of
+        what the unannotated, just-saved instance has
+        """
+        instance = serializer.instance
+        queryset = type(instance)._default_manager.filter(pk=instance.pk)
+        setup_eager_loading = getattr(self.get_serializer_class(), 'setup_eager_loading', None)
+        if setup_eager_loading is not None:
+            queryset = setup_eager_loading(queryset)
+        serializer.instance = queryset.get()
+
+
+class MethodPermissionsMixin:
+    """
+    Allow anyone to read, and require write_permissions for anything else.
+    
+    Permission classes hold no per-request state, so each view class
+    keeps one set of instances instead of building new ones per request.
+    """
+    read_permissions = (AllowAny(),)
+    write_permissions = (IsAuthenticated(),)
+    
+    def get_permissions(self):
+        if self.request.method in SAFE_METHODS:
+            return self.read_permissions
+        return self.write_permissions
 
 
-class RegisterView(generics.CreateAPIView):
+class RegisterView(async_generics.CreateAPIView):
     """
     User Registration Endpoint
     
     Creates a new user account and returns JWT tokens for immediate login.
     New users can optionally register as sellers to create products.
+    Async (adrf), like the other auth views, so waiting on the database
+    does not hold a worker thread under ASGI.
     """
     queryset = User.objects.all()
     serializer_class = RegisterSerializer
@@ -121,24 +248,23 @@ class RegisterView(generics.CreateAPIView):
             400: "Bad Request - Validation errors"
         }
     )
-    def create(self, request):
+    async def post(self, request, *args, **kwargs):
+        return await super().post(request, *args, **kwargs)
+    
+    async def acreate(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
-        serializer.is_valid(raise_exception=True)
-        user = serializer.save()
-        
-        # Generate JWT tokens for immediate login
-        refresh = RefreshToken.for_user(user)
+        await sync_to_async(serializer.is_valid)(raise_exception=True)
+        user = await sync_to_async(serializer.save)()
         
-        return Response({
-            'user': UserSerializer(user).data,
-            'tokens': {
-                'access': str(refresh.access_token),
-                'refresh': str(refresh)
-            }
+        # Generate JWT tokens for immediate login; a JsonResponse skips
+        # DRF's content negotiation and rendering for the success path
+        return JsonResponse({
+            'user': _AUTH_USER_SERIALIZER.to_representation(user),
+            'tokens': get_tokens_for_user(user)
         }, status=status.HTTP_201_CREATED)
 
 
-class LoginView(APIView):
+class LoginView(AsyncAPIView):
     """
     User Login Endpoint
     
@@ -175,24 +301,20 @@ class LoginView(APIView):
             400: "Bad Request - Invalid credentials"
         }
     )
-    def post(self, request):
+    async def post(self, request):
         serializer = LoginSerializer(data=request.data)
-        serializer.is_valid(raise_exception=True)
+        # Password hashing and the user lookup run off the event loop
+        await sync_to_async(serializer.is_valid)(raise_exception=True)
         user = serializer.validated_data['user']
         
         # Generate fresh JWT tokens
-        refresh = RefreshToken.for_user(user)
-        
-        return Response({
-            'user': UserSerializer(user).data,
-            'tokens': {
-                'access': str(refresh.access_token),
-                'refresh': str(refresh)
-            }
+        return JsonResponse({
+            'user': _AUTH_USER_SERIALIZER.to_representation(user),
+            'tokens': get_tokens_for_user(user)
         })
 
 
-class ProfileView(generics.RetrieveUpdateAPIView):
+class ProfileView(async_generics.RetrieveUpdateAPIView):
     """
     User Profile Management
     
@@ -202,16 +324,20 @@ class ProfileView(generics.RetrieveUpdateAPIView):
     serializer_class = UserSerializer
     permission_classes = [IsAuthenticated]
     
-    def get_object(self):
+    async def aget_object(self):
         """Return the current authenticated user"""
         return self.request.user
     
+    async def perform_aupdate(self, serializer):
+        # UserSerializer is a plain DRF serializer without asave()
+        await sync_to_async(serializer.save)()
+    
     @swagger_auto_schema(
         operation_description="Get current user profile information",
         responses={200: UserSerializer}
     )
-    def get(self, request, *args, **kwargs):
-        return super().get(request, *args, **kwargs)
+    async def get(self, request, *args, **kwargs):
+        return await super().get(request, *args, **kwargs)
     
     @swagger_auto_schema(
         operation_description="Update user profile (supports partial updates)",
@@ -220,31 +346,28 @@ class ProfileView(generics.RetrieveUpdateAPIView):
             400: "Bad Request - Validation errors"
         }
     )
-    def patch(self, request, *args, **kwargs):
-        return super().patch(request, *args, **kwargs)
+    async def patch(self, request, *args, **kwargs):
+        return await super().patch(request, *args, **kwargs)
 
 
-class CategoryListView(generics.ListCreateAPIView):
+class CategoryListView(CachedListMixin, EagerLoadingMixin, MethodPermissionsMixin,
+                       generics.ListCreateAPIView):
     """
     Category Management
     
     List all active categories with optional filtering and search.
     Authenticated users can create new categories.
     """
-    queryset = Category.objects.filter(is_active=True).prefetch_related('products')
+    queryset = Category.objects.filter(is_active=True).only(*CategorySerializer.LIST_FIELDS)
     serializer_class = CategorySerializer
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    filter_backends = [LazyDjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     filterset_class = CategoryFilter
+    cache_namespace = CATEGORY_LIST_CACHE
+    shared_cache_timeout = CATEGORY_LIST_CACHE_TIMEOUT
     search_fields = ['name', 'description']
     ordering_fields = ['name', 'created_at']
     ordering = ['name']
     
-    def get_permissions(self):
-        """Allow anyone to view, authenticated users to create"""
-        if self.request.method == 'GET':
-            return [AllowAny()]
-        return [IsAuthenticated()]
-    
     @swagger_auto_schema(
         operation_description="""
         List categories with filtering and search
@@ -272,26 +395,35 @@ class CategoryListView(generics.ListCreateAPIView):
         return super().post(request, *args, **kwargs)
 
 
-class ProductListView(generics.ListCreateAPIView):
+class ProductListView(CachedListMixin, EagerLoadingMixin, MethodPermissionsMixin,
+                      generics.ListCreateAPIView):
     """
     Product Catalog Management
     
     Comprehensive product listing with advanced filtering, search, and sorting.
     Only sellers can create new products.
     """
-    queryset = Product.objects.filter(is_active=True).select_related('seller').prefetch_related('categories')
+    queryset = Product.objects.filter(is_active=True)
     serializer_class = ProductSerializer
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    pagination_class = ProductCursorPagination
+    filter_backends = [LazyDjangoFilterBackend, ProductSearchFilter, StrictOrderingFilter]
     filterset_class = ProductFilter
-    search_fields = ['name', 'description', 'sku']
-    ordering_fields = ['name', 'price', 'created_at', 'view_count', 'stock_quantity']
+    cache_namespace = PRODUCT_LIST_CACHE
+    # Each ordering field is index-backed (Product.Meta.indexes); index any
+    # field added here, or sorting the catalog becomes a full sort. Not
+    # view_count: an index on it turns the UPDATE on every product view
+    # into a non-HOT update that writes to all of the table's indexes
+    ordering_fields = ['name', 'price', 'created_at', 'stock_quantity']
     ordering = ['-created_at']
+    write_permissions = (IsSellerOrReadOnly(),)
+    stream_param = 'stream'
+    stream_chunk_size = 500
     
-    def get_permissions(self):
-        """Allow anyone to view, authenticated sellers to create"""
+    def get_serializer_class(self):
+        """Use the lightweight serializer for listing, full one for creating"""
         if self.request.method == 'GET':
-            return [AllowAny()]
-        return [IsAuthenticated()]
+            return ProductListSerializer
+        return ProductSerializer
     
     @swagger_auto_schema(
         operation_description="""
@@ -303,12 +435,20 @@ class ProductListView(generics.ListCreateAPIView):
         - Stock: ?in_stock=true or ?low_stock=true
         - Seller: ?seller=username
         - Featured: ?is_featured=true
-        - Search: ?search=iphone (searches name, description, SKU)
+        - Search: ?search=iphone (full-text over name and description, or a
+          SKU prefix such as ?search=IPH-; ?q= is an alias)
         - Sort: ?ordering=price or ?ordering=-price
         
         Combine multiple filters: ?search=phone&min_price=1000&in_stock=true&ordering=-price
+        
+        Results are cursor-paginated: follow the next/previous links
+        (there is no total count or ?page= parameter). Add ?stream=1 to
+        receive every matching product unpaginated as NDJSON instead.
+        
+        Categories are returned as a list of names; use the product
+        detail endpoint for full category information.
         """,
-        responses={200: ProductSerializer(many=True)}
+        responses={200: ProductListSerializer(many=True)}
     )
     def get(self, request, *args, **kwargs):
         return super().get(request, *args, **kwargs)
@@ -330,31 +470,54 @@ class ProductListView(generics.ListCreateAPIView):
     def post(self, request, *args, **kwargs):
         return super().post(request, *args, **kwargs)
     
+    def list(self, request, *args, **kwargs):
+        if request.query_params.get(self.stream_param) == '1':
+            return self.stream_list(request)
+        return super().list(request, *args, **kwargs)
+    
+    def stream_list(self, request):
+        """
+        Stream every matching product as newline-delimited JSON, reading
+        rows in chunks so memory stays bounded by the chunk size
+        """
+        queryset = self.filter_queryset(self.get_queryset())
+        to_representation = self.get_serializer().to_representation
+        renderer = ORJSONRenderer()
+        rows = (
+            renderer.render(to_representation(product)) + b'\n'
+            for product in queryset.iterator(chunk_size=self.stream_chunk_size)
+        )
+        if isinstance(request._request, ASGIRequest):
+            # Under ASGI Django would drain a sync iterator into a list
+            # before sending anything; hand it an async one instead
+            rows = self.iterate_in_batches(rows)
+        return StreamingHttpResponse(rows, content_type='application/x-ndjson')
+    
+    async def iterate_in_batches(self, rows):
+        """Yield from the sync iterator rows, one chunk per thread hop"""
+        next_batch = sync_to_async(lambda: list(islice(rows, self.stream_chunk_size)))
+        while batch := await next_batch():
+            for row in batch:
+                yield row
+    
     def perform_create(self, serializer):
-        """Validate seller permissions and save product"""
-        if not self.request.user.is_seller:
-            from rest_framework.exceptions import PermissionDenied
-            raise PermissionDenied("Only sellers can create products. Set is_seller=true in your profile.")
+        """Save product; seller permission is checked in get_permissions"""
         serializer.save()
+        self.reload_saved_instance(serializer)
 
 
-class ProductDetailView(generics.RetrieveUpdateDestroyAPIView):
+class ProductDetailView(EagerLoadingMixin, MethodPermissionsMixin,
+                        generics.RetrieveUpdateDestroyAPIView):
     """
     Individual Product Management
     
     View, update, or delete specific products by slug.
     Automatically tracks view count for analytics.
     """
-    queryset = Product.objects.select_related('seller').prefetch_related('categories')
+    queryset = Product.objects.all()
     serializer_class = ProductSerializer
     lookup_field = 'slug'
     
-    def get_permissions(self):
-        """Allow anyone to view, authenticated users to modify their own products"""
-        if self.request.method == 'GET':
-            return [AllowAny()]
-        return [IsAuthenticated()]
-    
     @swagger_auto_schema(
         operation_description="""
         Get product details by slug
@@ -374,15 +537,17 @@ class ProductDetailView(generics.RetrieveUpdateDestroyAPIView):
         """Get product and increment view count for GET requests"""
         obj = super().get_object()
         if self.request.method == 'GET':
-            # Increment view count for analytics (non-blocking)
-            Product.objects.filter(pk=obj.pk).update(
-                view_count=models.F('view_count') + 1
-            )
-            obj.refresh_from_db()
+            # Increment view count for analytics
+            obj.increment_view_count()
         return obj
     
+    def perform_update(self, serializer):
+        serializer.save()
+        self.reload_saved_instance(serializer)
+
 
-class CategoryDetailView(generics.RetrieveUpdateDestroyAPIView):
+class CategoryDetailView(EagerLoadingMixin, MethodPermissionsMixin,
+                         generics.RetrieveUpdateDestroyAPIView):
     """
     Category Detail Management
     
@@ -393,12 +558,6 @@ class CategoryDetailView(generics.RetrieveUpdateDestroyAPIView):
     serializer_class = CategorySerializer
     lookup_field = 'slug'
     
-    def get_permissions(self):
-        """Allow anyone to view, authenticated users to modify"""
-        if self.request.method == 'GET':
-            return [AllowAny()]
-        return [IsAuthenticated()]
-    
     @swagger_auto_schema(
         operation_description="Get category details by slug",
         responses={
@@ -53,6 +53,7 @@ INSTALLED_APPS = [
     'rest_framework_simplejwt',
     'corsheaders',
     'drf_yasg',
+    'servestatic',
     
     # Local app
     'django_filters',
@@ -67,7 +68,9 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
-    'whitenoise.middleware.WhiteNoiseMiddleware',
+    # servestatic: WhiteNoise's async-capable fork. Every middleware here
+    # must be async-capable, or each ASGI request is adapted to a thread
+    'servestatic.middleware.ServeStaticMiddleware',
 ]
 
 ROOT_URLCONF = 'ecommerce_backend.urls'
@@ -134,6 +137,15 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# Argon2 verifies faster than Django's default PBKDF2 for comparable
+# strength; the PBKDF2 hashers stay so existing passwords still work and
+# are rehashed with Argon2 on the next successful login
+PASSWORD_HASHERS = [
+    'django.contrib.auth.hashers.Argon2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+]
+
 
 # Internationalization
 # https://docs.djangoproject.com/en/5.2/topics/i18n/
@@ -177,7 +189,7 @@ REST_FRAMEWORK = {
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 20,
     'DEFAULT_RENDERER_CLASSES': [
-        'rest_framework.renderers.JSONRenderer',
+        'app.renderers.ORJSONRenderer',
     ],
     'DEFAULT_PARSER_CLASSES': [
         'rest_framework.parsers.JSONParser',
@@ -185,7 +197,7 @@ REST_FRAMEWORK = {
         'rest_framework.parsers.FormParser',
     ],
     'DEFAULT_FILTER_BACKENDS': [
-        'django_filters.rest_framework.DjangoFilterBackend',
+        'app.filters.LazyDjangoFilterBackend',
         'rest_framework.filters.SearchFilter',
         'rest_framework.filters.OrderingFilter',
     ],
@@ -202,6 +214,22 @@ SIMPLE_JWT = {
     'SIGNING_KEY': config('JWT_SECRET_KEY', default=SECRET_KEY),
 }
 
+# Cache Configuration
+# Local memory cache by default; set REDIS_URL to share the cache between
+# workers (required for buffered view counts)
+if config('REDIS_URL', default=''):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': config('REDIS_URL'),
+        }
+    }
+
+# Count product views in the cache and write them to the database in
+# batches with `python manage.py flush_view_counts` (run it periodically).
+# Needs REDIS_URL: a process-local cache fails system check app.E001
+BUFFER_PRODUCT_VIEW_COUNTS = config('BUFFER_PRODUCT_VIEW_COUNTS', default=False, cast=bool)
+
 # CORS Configuration
 CORS_ALLOWED_ORIGINS = [
     "http://localhost:3000",
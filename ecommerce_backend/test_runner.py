@@ -0,0 +1,18 @@
+"""
+Test runner for ALX Project Nexus
+"""
+from django.test.runner import DiscoverRunner, get_max_test_processes
+
+
+class ParallelDiscoverRunner(DiscoverRunner):
+    """
+    DiscoverRunner that spreads test cases across all CPU cores by default.
+    
+    Each worker gets its own clone of the test database. Pass
+    --parallel=1 (or set DJANGO_TEST_PROCESSES) to limit the processes.
+    """
+    
+    def __init__(self, parallel=0, **kwargs):
+        if not parallel and not kwargs.get('pdb'):
+            parallel = get_max_test_processes()
+        super().__init__(parallel=parallel, **kwargs)
@@ -0,0 +1,42 @@
+"""
+Django settings used when running the test suite.
+
+Imports the project settings and overrides only what makes tests
+faster. Selected automatically by ``manage.py test``.
+"""
+
+from decouple import config
+
+from .settings import *  # noqa: F401,F403
+
+# PBKDF2 is deliberately slow; tests only need hashing to round-trip
+PASSWORD_HASHERS = [
+    'django.contrib.auth.hashers.MD5PasswordHasher',
+]
+
+# In-memory SQLite avoids fsync and network round-trips per test, even
+# when the project itself runs on PostgreSQL. Set TEST_USE_POSTGRESQL=True
+# to exercise the PostgreSQL-only paths (full-text search, trigram index).
+if not config('TEST_USE_POSTGRESQL', default=False, cast=bool):
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': ':memory:',
+        }
+    }
+    
+    class DisableMigrations:
+        """Build the test schema straight from the models (no migration replay)"""
+        
+        def __contains__(self, item):
+            return True
+        
+        def __getitem__(self, item):
+            return None
+    
+    # Only safe on SQLite: the PostgreSQL-only migrations also install the
+    # search trigger and GIN indexes that the full-text paths depend on
+    MIGRATION_MODULES = DisableMigrations()
+
+# Run independent test cases in parallel worker processes
+TEST_RUNNER = 'ecommerce_backend.test_runner.ParallelDiscoverRunner'
@@ -14,12 +14,6 @@ Including another URLconf
     1. Import the include() function: from django.urls import include, path
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
-"""
-URL configuration for ecommerce_backend project.
-"""
-"""
-URL configuration for ecommerce_backend project.
-"""
 from django.contrib import admin
 from django.urls import path, re_path, include
 from django.conf import settings